@@ -0,0 +1,27 @@
+"""
+Chargement paresseux et mis en cache de la configuration Elasticsearch.
+
+load_dotenv() relit et re-parse le fichier .env à chaque import des
+modules de config ; on ne le fait qu'une fois et on fige les variables
+dans un dict réutilisé partout.
+"""
+
+import functools
+import os
+from dotenv import load_dotenv
+
+_ENV_KEYS = (
+    "ELASTICSEARCH_HOST",
+    "ELASTICSEARCH_PORT",
+    "ELASTICSEARCH_SCHEME",
+    "ELASTICSEARCH_USERNAME",
+    "ELASTICSEARCH_PASSWORD",
+    "ELASTICSEARCH_INDEX",
+)
+
+
+@functools.lru_cache(maxsize=1)
+def load():
+    """Parse .env une seule fois et retourne l'instantané des variables"""
+    load_dotenv()
+    return {key: os.environ.get(key) for key in _ENV_KEYS}
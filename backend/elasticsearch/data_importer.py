@@ -4,6 +4,7 @@ Importateur optimisé pour 5000+ documents sans embeddings
 Version rapide pour développement
 """
 
+import gzip
 import json
 import requests
 import time
@@ -13,6 +14,11 @@ from pathlib import Path
 from tqdm import tqdm
 import logging
 
+try:
+    from backend.elasticsearch.es_config import es_config
+except ImportError:
+    from es_config import es_config
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -21,18 +27,25 @@ class DataImporter:
     """Importateur optimisé pour datasets de développement (5000+ docs)"""
     
     def __init__(self):
-        self.es_url = "http://localhost:9200"
-        self.index_name = "arxiv_papers"
-        self.batch_size = 500
+        # Réglages partagés depuis es_config : URL, index et paramètres
+        # bulk pilotables par l'environnement (ES_BULK_CHUNK, ES_BULK_BYTES)
+        self.es_url = f"{es_config.scheme}://{es_config.host}:{es_config.port}"
+        self.index_name = es_config.index_name
+        self.batch_size = es_config.bulk_chunk_size
+        self.bulk_max_bytes = es_config.bulk_max_bytes
         self.max_docs = 5000
-        
+
+        # Session persistante : keep-alive vers ES au lieu d'une poignée
+        # de main TCP par requête
+        self.session = requests.Session()
+
         # Vérifier la connexion Elasticsearch
         self.check_elasticsearch()
     
     def check_elasticsearch(self):
         """Vérifie la connexion à Elasticsearch"""
         try:
-            response = requests.get(self.es_url, timeout=10)
+            response = self.session.get(self.es_url, timeout=10)
             if response.status_code == 200:
                 logger.info(f"✅ Connecté à Elasticsearch: {self.es_url}")
                 return True
@@ -64,8 +77,9 @@ class DataImporter:
             logger.error("❌ Aucun dossier data trouvé")
             return []
         
-        # Fichiers JSON à rechercher
-        json_patterns = ["*.json", "cleaned/*.json"]
+        # Fichiers JSON à rechercher (.jsonl inclus : clean_data écrit
+        # désormais le corpus nettoyé en JSON Lines)
+        json_patterns = ["*.json", "*.jsonl", "cleaned/*.json", "cleaned/*.jsonl"]
         data_files = []
         
         for pattern in json_patterns:
@@ -97,7 +111,11 @@ class DataImporter:
             try:
                 logger.info(f"  Lecture de {filepath.name}...")
                 with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                    if filepath.suffix == '.jsonl':
+                        # JSON Lines : un document par ligne
+                        data = [json.loads(line) for line in f if line.strip()]
+                    else:
+                        data = json.load(f)
                 
                 if not isinstance(data, list):
                     logger.warning(f"    ⚠ Format invalide dans {filepath.name} (attendu liste)")
@@ -219,10 +237,10 @@ class DataImporter:
         
         # Vérifier si l'index existe déjà
         try:
-            response = requests.get(f"{self.es_url}/{self.index_name}")
+            response = self.session.get(f"{self.es_url}/{self.index_name}")
             if response.status_code == 200:
                 logger.info("🗑️ Index existe déjà, suppression...")
-                requests.delete(f"{self.es_url}/{self.index_name}")
+                self.session.delete(f"{self.es_url}/{self.index_name}")
                 time.sleep(2)
         except:
             pass
@@ -270,7 +288,7 @@ class DataImporter:
         }
         
         try:
-            response = requests.put(
+            response = self.session.put(
                 f"{self.es_url}/{self.index_name}",
                 json=mapping,
                 timeout=30
@@ -298,25 +316,35 @@ class DataImporter:
         for i in tqdm(range(0, len(documents), self.batch_size), 
                      desc="Importation", unit="batch"):
             batch = documents[i:i + self.batch_size]
-            
-            # Préparer le format bulk
+
+            # Préparer le format bulk ; le lot est scindé en cours de
+            # route si le payload NDJSON dépasse bulk_max_bytes
             bulk_data = []
+            bulk_bytes = 0
+            success = True
             for doc in batch:
                 # Action d'indexation
-                bulk_data.append(json.dumps({
+                action = json.dumps({
                     "index": {
                         "_index": self.index_name,
                         "_id": doc["id"]
                     }
-                }))
+                })
                 # Document
-                bulk_data.append(json.dumps(doc))
-            
-            # Convertir en NDJSON
-            ndjson = '\n'.join(bulk_data) + '\n'
-            
+                body = json.dumps(doc)
+
+                if bulk_data and bulk_bytes + len(action) + len(body) > self.bulk_max_bytes:
+                    success = self.send_batch_with_retry('\n'.join(bulk_data) + '\n') and success
+                    bulk_data = []
+                    bulk_bytes = 0
+
+                bulk_data.append(action)
+                bulk_data.append(body)
+                bulk_bytes += len(action) + len(body) + 2
+
             # Envoyer avec retry
-            success = self.send_batch_with_retry(ndjson)
+            if bulk_data:
+                success = self.send_batch_with_retry('\n'.join(bulk_data) + '\n') and success
             if success:
                 total_imported += len(batch)
             
@@ -341,12 +369,18 @@ class DataImporter:
     
     def send_batch_with_retry(self, ndjson_data, max_retries=3):
         """Envoie un batch avec mécanisme de retry"""
+        # Compressé une seule fois pour toutes les tentatives : le NDJSON
+        # texte se compresse très bien et transite d'autant plus vite
+        payload = gzip.compress(ndjson_data.encode('utf-8'))
         for attempt in range(max_retries):
             try:
-                response = requests.post(
+                response = self.session.post(
                     f"{self.es_url}/_bulk",
-                    data=ndjson_data,
-                    headers={'Content-Type': 'application/x-ndjson'},
+                    data=payload,
+                    headers={
+                        'Content-Type': 'application/x-ndjson',
+                        'Content-Encoding': 'gzip'
+                    },
                     timeout=60
                 )
                 
@@ -385,10 +419,10 @@ class DataImporter:
         
         try:
             # Rafraîchir l'index
-            requests.post(f"{self.es_url}/{self.index_name}/_refresh", timeout=10)
+            self.session.post(f"{self.es_url}/{self.index_name}/_refresh", timeout=10)
             
             # Compter les documents
-            response = requests.get(f"{self.es_url}/{self.index_name}/_count", timeout=10)
+            response = self.session.get(f"{self.es_url}/{self.index_name}/_count", timeout=10)
             if response.status_code == 200:
                 count = response.json().get('count', 0)
                 logger.info(f"📊 Documents dans l'index: {count:,}")
@@ -403,7 +437,7 @@ class DataImporter:
                     "size": 1
                 }
                 
-                response = requests.post(
+                response = self.session.post(
                     f"{self.es_url}/{self.index_name}/_search",
                     json=test_query,
                     timeout=10
@@ -438,7 +472,7 @@ class DataImporter:
         
         try:
             # Fusionner les segments
-            response = requests.post(
+            response = self.session.post(
                 f"{self.es_url}/{self.index_name}/_forcemerge?max_num_segments=1",
                 timeout=120  # Long timeout pour le merge
             )
@@ -449,7 +483,7 @@ class DataImporter:
                 logger.warning(f"⚠ Fusion échouée: {response.status_code}")
             
             # Statistiques
-            response = requests.get(f"{self.es_url}/{self.index_name}/_stats/store", timeout=10)
+            response = self.session.get(f"{self.es_url}/{self.index_name}/_stats/store", timeout=10)
             if response.status_code == 200:
                 stats = response.json()
                 size_bytes = stats['indices'][self.index_name]['total']['store']['size_in_bytes']
@@ -3,7 +3,7 @@
 Script d'importation spécifique pour les données arXiv téléchargées.
 """
 
-import json
+import ijson
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -30,6 +30,35 @@ except ImportError:
     logger.info("✅ Utilisation de es_config standard")
 from ai.embeddings.sentence_bert_handler import SentenceBERTHandler
 
+def build_docs(batch, embeddings, format_date, start):
+    """Assemble les documents d'un lot, prêts à indexer.
+
+    Boucle serrée volontairement : les lookups (article.get, append) sont
+    liés à des variables locales pour réduire le coût par document une fois
+    les embeddings calculés.
+    """
+    docs = []
+    append = docs.append
+    for offset, article in enumerate(batch):
+        get = article.get
+        authors = get("authors", [])
+        if isinstance(authors, str):
+            authors = [authors]
+        append({
+            "id": get("arxiv_id", f"doc_{start + offset}"),
+            "title": get("title", ""),
+            "abstract": get("abstract", ""),
+            "authors": authors,
+            "categories": get("categories", []),
+            "primary_category": get("main_category", ""),
+            "date": format_date(get("published", "")),
+            "year": get("publication_year", 2023),
+            "month": get("publication_month", 1),
+            "source": "arXiv",
+            "combined_embedding": embeddings[offset].tolist()
+        })
+    return docs
+
 class ArXivDataImporter:
     """Importateur corrigé avec gestion des dates"""
     
@@ -41,7 +70,7 @@ class ArXivDataImporter:
         self.es = es_config.get_client()
         self.index_name = es_config.index_name
         self.embedding_model = SentenceBERTHandler()
-        self.batch_size = 10
+        self.batch_size = 64
     
     def format_date(self, date_str):
         """Formate une date pour Elasticsearch"""
@@ -120,79 +149,141 @@ class ArXivDataImporter:
             return False
     
     def load_data(self, limit=None):
-        """Charge les données"""
+        """Charge les données en flux, un article à la fois.
+
+        json.load matérialisait toute la liste en RAM juste pour l'itérer ;
+        ijson parse le fichier incrémentalement et la mémoire reste constante
+        quelle que soit la taille du dump.
+        """
         logger.info(f"📖 Chargement depuis {self.data_path}")
-        
+
         if not self.data_path.exists():
             logger.error(f"❌ Fichier introuvable")
-            return []
-        
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if limit:
-            data = data[:limit]
-        
-        logger.info(f"✅ {len(data)} articles chargés")
-        return data
+            return
+
+        with open(self.data_path, 'rb') as f:
+            for i, article in enumerate(ijson.items(f, 'item')):
+                if limit and i >= limit:
+                    break
+                yield article
     
+    def encode_batch(self, texts):
+        """Encode un lot de textes en sautant les textes vides.
+
+        Les textes vides recevraient quand même un passage complet dans le
+        transformer : on n'encode que les positions non vides et on laisse
+        des zéros pour les autres.
+        """
+        embeddings = np.zeros((len(texts), 384), dtype=np.float32)
+        nonempty_idx = [i for i, t in enumerate(texts) if t]
+        if nonempty_idx:
+            nonempty_texts = [texts[i] for i in nonempty_idx]
+            embeddings[nonempty_idx] = self.embedding_model.encode(nonempty_texts)
+        return embeddings
+
+    def set_import_settings(self):
+        """Coupe le refresh et la réplication le temps de l'import.
+
+        Le refresh périodique (1s par défaut) et la réplication rivalisent
+        avec l'ingestion ; on les désactive pendant l'import massif.
+        """
+        # Mémoriser le nombre de réplicas d'avant import pour le
+        # restaurer ensuite (l'index peut être partagé et configuré
+        # différemment de notre création)
+        self._pre_import_replicas = "0"
+        try:
+            current = self.es.indices.get_settings(index=self.index_name)
+            index_settings = current[self.index_name]["settings"]["index"]
+            self._pre_import_replicas = index_settings.get("number_of_replicas", "0")
+        except Exception as e:
+            logger.warning(f"⚠ Impossible de lire les settings courants: {e}")
+
+        try:
+            self.es.indices.put_settings(
+                index=self.index_name,
+                body={"index": {"refresh_interval": "-1", "number_of_replicas": 0}}
+            )
+            logger.info("⚙️ refresh_interval=-1 et replicas=0 pendant l'import")
+        except Exception as e:
+            logger.warning(f"⚠ Impossible de régler les settings d'import: {e}")
+
+    def restore_settings(self):
+        """Restaure le refresh et les réplicas, puis force un refresh final"""
+        replicas = getattr(self, '_pre_import_replicas', "0")
+        try:
+            self.es.indices.put_settings(
+                index=self.index_name,
+                body={"index": {
+                    "refresh_interval": "1s",
+                    "number_of_replicas": replicas
+                }}
+            )
+            self.es.indices.refresh(index=self.index_name)
+            logger.info(f"⚙️ refresh_interval restauré à 1s, replicas à {replicas}")
+        except Exception as e:
+            logger.warning(f"⚠ Impossible de restaurer les settings: {e}")
+
     def process_and_import(self, limit=None):
         """Traite et importe les données"""
-        # Charger
-        articles = self.load_data(limit)
-        if not articles:
-            return False
-        
-        # Traiter
+        # Traiter au fil du flux : les lots sont construits directement
+        # depuis le générateur, sans jamais charger tout le fichier
         logger.info("🔧 Traitement des articles...")
+        self.set_import_settings()
         imported_count = 0
-        
-        for i, article in enumerate(tqdm(articles, desc="Importation")):
+        total = 0
+        batch = []
+
+        progress = tqdm(desc="Importation", unit="article")
+        for article in self.load_data(limit):
+            batch.append(article)
+            if len(batch) >= self.batch_size:
+                imported_count += self.import_batch(batch, total)
+                total += len(batch)
+                progress.update(len(batch))
+                batch = []
+
+        # Dernier lot partiel
+        if batch:
+            imported_count += self.import_batch(batch, total)
+            total += len(batch)
+            progress.update(len(batch))
+        progress.close()
+
+        self.restore_settings()
+        logger.info(f"✅ {imported_count}/{total} articles importés")
+        return imported_count > 0
+
+    def import_batch(self, batch, start):
+        """Encode et indexe un lot d'articles, retourne le nombre importé"""
+        # Générer les embeddings par lot (masque sur les textes vides)
+        texts = [
+            f"{article.get('title', '')} {article.get('abstract', '')}".strip()
+            for article in batch
+        ]
+        embeddings = self.encode_batch(texts)
+
+        # Assembler les documents en une passe
+        docs = build_docs(batch, embeddings, self.format_date, start)
+
+        imported = 0
+        for offset, doc in enumerate(docs):
             try:
-                # Créer le document
-                doc = {
-                    "id": article.get("arxiv_id", f"doc_{i}"),
-                    "title": article.get("title", ""),
-                    "abstract": article.get("abstract", ""),
-                    "authors": article.get("authors", []),
-                    "categories": article.get("categories", []),
-                    "primary_category": article.get("main_category", ""),
-                    "date": self.format_date(article.get("published", "")),
-                    "year": article.get("publication_year", 2023),
-                    "month": article.get("publication_month", 1),
-                    "source": "arXiv"
-                }
-                
-                # Nettoyer les listes
-                if isinstance(doc["authors"], str):
-                    doc["authors"] = [doc["authors"]]
-                
-                # Générer les embeddings
-                text = f"{doc['title']} {doc['abstract']}"
-                embedding = self.embedding_model.encode([text])[0].tolist()
-                doc["combined_embedding"] = embedding
-                
-                # Indexer
+                # Indexer (pas de refresh par requête, il est désactivé
+                # pendant l'import et restauré à la fin)
                 self.es.index(
                     index=self.index_name,
                     id=doc["id"],
-                    body=doc,
-                    refresh=True
+                    body=doc
                 )
-                
-                imported_count += 1
-                
-                # Log progress
-                if (i + 1) % 10 == 0:
-                    logger.info(f"  {i + 1} articles traités")
-                    
+
+                imported += 1
+
             except Exception as e:
-                logger.warning(f"⚠ Erreur article {i}: {e}")
+                logger.warning(f"⚠ Erreur article {start + offset}: {e}")
                 continue
-        
-        logger.info(f"✅ {imported_count}/{len(articles)} articles importés")
-        return imported_count > 0
-    
+
+        return imported
+
     def verify_import(self):
         """Vérifie l'importation"""
         try:
@@ -6,20 +6,209 @@ Version pour exécution depuis l'hôte
 """
 
 import json
-import requests
+import ijson
+import orjson
 import time
+from elasticsearch import Elasticsearch
+from elasticsearch.helpers import parallel_bulk
+
+# Sérialiseur orjson (extension C, ~3-5x plus rapide que json stdlib)
+# pour le chemin chaud du bulk ; repli sur le sérialiseur par défaut
+try:
+    from elastic_transport import OrjsonSerializer
+    _bulk_serializer = OrjsonSerializer()
+except ImportError:
+    _bulk_serializer = None
 import hashlib
+import re
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from tqdm import tqdm
 import logging
-import random
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def fingerprint(std):
+    """Empreinte BLAKE2b-128 du contenu d'un document standardisé.
+
+    Une seule passe de hachage sur titre + abstract sert à la fois de clé
+    de déduplication (bytes bruts) et d'_id Elasticsearch (via .hex() à
+    la frontière). Contenu seulement : le même papier présent dans
+    plusieurs fichiers source (arxiv_cs, simplified, cleaned, enhanced…)
+    produit la même empreinte et n'est gardé qu'une fois.
+
+    Hachage incrémental : chaque champ est encodé et absorbé directement,
+    sans construire de string concaténée intermédiaire."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(std['title'].encode())
+    h.update(b'\0')
+    h.update(std['abstract'].encode())
+    return h.digest()
+
+# Regex précompilée pour YYYY-MM-DD en tête de chaîne
+_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+
+def extract_date_info(doc):
+    """Extrait les informations de date"""
+    date_str = doc.get('published', doc.get('date', doc.get('publication_date', '')))
+
+    # Un seul match plutôt que des tests caractère par caractère
+    if isinstance(date_str, str):
+        m = _DATE_RE.match(date_str)
+        if m:
+            return {
+                'date': m.group(0),
+                'year': int(m.group(1)),
+                'month': int(m.group(2))
+            }
+
+    # Fallback
+    year = doc.get('year', 2025)
+    month = doc.get('month', 1)
+    return {
+        'date': f"{year}-{month:02d}-01",
+        'year': year,
+        'month': month
+    }
+
+def _make_list_parser(sample_value, key):
+    """Choisit une stratégie de parsing pour un champ liste (authors,
+    categories) d'après le premier document du fichier.
+
+    Évite de rejouer isinstance + try/except json.loads sur chaque
+    document quand le format est constant dans un même fichier.
+    """
+    if isinstance(sample_value, str):
+        if sample_value.lstrip().startswith('['):
+            # Liste encodée en JSON dans une string
+            def parse(doc):
+                try:
+                    return [str(v).strip() for v in orjson.loads(doc.get(key, '[]')) if v]
+                except orjson.JSONDecodeError:
+                    return []
+        else:
+            # Valeurs séparées par des virgules
+            def parse(doc):
+                return [v.strip() for v in doc.get(key, '').split(',') if v.strip()]
+    else:
+        # Vraie liste JSON
+        def parse(doc):
+            return [str(v).strip() for v in doc.get(key, ()) if v]
+    return parse
+
+def _make_extractor(sample_doc, source_file, import_ts):
+    """Construit un extracteur standardisé spécialisé pour un fichier.
+
+    Les chaînes de .get() en cascade (title/Title, abstract/Abstract/
+    summary, arxiv_id/id) sont résolues une seule fois sur le premier
+    document du fichier ; la closure retournée fait ensuite des lookups
+    directs pour tous les documents suivants du même schéma.
+    """
+    title_key = 'title' if 'title' in sample_doc else 'Title'
+    if 'abstract' in sample_doc:
+        abstract_key = 'abstract'
+    elif 'Abstract' in sample_doc:
+        abstract_key = 'Abstract'
+    else:
+        abstract_key = 'summary'
+    id_key = 'arxiv_id' if 'arxiv_id' in sample_doc else 'id'
+
+    # Lier les helpers à des locales pour la boucle chaude
+    parse_authors = _make_list_parser(sample_doc.get('authors', []), 'authors')
+    parse_categories = _make_list_parser(sample_doc.get('categories', []), 'categories')
+
+    def extract(doc):
+        try:
+            # Extraire les champs de base
+            title = doc.get(title_key, '')
+            abstract = doc.get(abstract_key, '')
+
+            if not title or not abstract:
+                return None
+
+            # Nettoyer
+            title = str(title).strip()
+            abstract = str(abstract).strip()
+
+            # Vérifier la longueur minimale
+            if len(abstract) < 50:
+                return None
+
+            # Limiter la longueur de l'abstract
+            if len(abstract) > 5000:
+                abstract = abstract[:5000] + "..."
+
+            categories = parse_categories(doc)
+            date_info = extract_date_info(doc)
+
+            return {
+                "title": title,
+                "abstract": abstract,
+                "arxiv_id": doc.get(id_key, ''),
+                "authors": parse_authors(doc),
+                "categories": categories,
+                "primary_category": categories[0] if categories else "",
+                "date": date_info['date'],
+                "year": date_info['year'],
+                "month": date_info['month'],
+                "source": "arXiv",
+                "import_source": source_file,
+                "import_timestamp": import_ts,
+                "content_length": len(abstract)
+            }
+
+        except Exception as e:
+            logger.error(f"❌ Erreur standardisation: {e}")
+            return None
+
+    return extract
+
+def parse_file(args):
+    """Parse et standardise un fichier JSON complet (exécuté dans un worker).
+
+    Fonction de module (donc picklable) : le parsing ijson et l'extraction
+    de champs sont du CPU pur Python que le GIL empêche de paralléliser en
+    threads, chaque fichier part donc dans son propre processus. La
+    déduplication reste séquentielle côté parent.
+    """
+    filepath, import_ts = args
+    filepath = Path(filepath)
+    docs = []
+    total_in_file = 0
+    extract = None
+
+    try:
+        with open(filepath, 'rb') as f:
+            if filepath.suffix == '.jsonl':
+                # JSON Lines (sortie de clean_data) : un document par ligne
+                doc_iter = (orjson.loads(line) for line in f if line.strip())
+            else:
+                doc_iter = ijson.items(f, 'item')
+
+            for doc in doc_iter:
+                total_in_file += 1
+
+                # Spécialiser l'extracteur sur le schéma du premier
+                # document du fichier, puis le réutiliser
+                if extract is None:
+                    extract = _make_extractor(doc, filepath.name, import_ts)
+
+                standardized = extract(doc)
+                if standardized:
+                    docs.append(standardized)
+
+    except (ijson.JSONError, orjson.JSONDecodeError) as e:
+        # Couvre aussi les fichiers dont la racine n'est pas un tableau
+        logger.error(f"    ❌ Erreur JSON dans {filepath.name}: {e}")
+    except Exception as e:
+        logger.error(f"    ❌ Erreur {filepath.name}: {e}")
+
+    return filepath.name, total_in_file, docs
+
 class DataImporterFixed:
     """Importateur avec IDs uniques pour éviter les écrasements"""
     
@@ -30,38 +219,57 @@ class DataImporterFixed:
         self.index_name = "arxiv_papers_unique"
         self.batch_size = 500
         self.max_docs = 10000
+        # Le forcemerge est optionnel : sur un index mono-shard de ~10k
+        # docs, le gain en lecture est marginal et le merge écrit tout
+        # l'index séquentiellement
+        self.do_forcemerge = os.getenv('ES_FORCEMERGE', '0') == '1'
+        # Horodatage du début de l'import, partagé par tous les documents
+        # (évite un appel strftime par document)
+        self.import_ts = time.strftime("%Y-%m-%d %H:%M:%S")
         
         logger.info(f"🔗 URL Elasticsearch: {self.es_url}")
         logger.info(f"📁 Index cible: {self.index_name}")
-        
+
+        # Client unique partagé par tout l'importateur : pool de connexions
+        # keep-alive au lieu d'une poignée de main TCP par appel requests
+        self.es = self._new_client()
+
         # Vérifier la connexion
         self.check_elasticsearch()
-    
+
+    def _new_client(self):
+        """Crée le client Elasticsearch partagé"""
+        es_kwargs = {
+            'request_timeout': 60,
+            'max_retries': 3,
+            'retry_on_timeout': True,
+            # Corps gzippés : le NDJSON d'abstracts compresse ~5x,
+            # http.compression est actif par défaut côté ES
+            'http_compress': True,
+        }
+        if _bulk_serializer is not None:
+            es_kwargs['serializer'] = _bulk_serializer
+        return Elasticsearch([self.es_url], **es_kwargs)
+
     def check_elasticsearch(self):
         """Vérifie la connexion à Elasticsearch"""
         max_retries = 5
         for attempt in range(max_retries):
             try:
                 logger.info(f"🔍 Tentative de connexion {attempt + 1}/{max_retries}...")
-                response = requests.get(self.es_url, timeout=10)
-                if response.status_code == 200:
-                    logger.info(f"✅ Connecté à Elasticsearch: {self.es_url}")
-                    # Afficher les infos
-                    info = response.json()
-                    logger.info(f"   Version: {info['version']['number']}")
-                    logger.info(f"   Cluster: {info['cluster_name']}")
-                    return True
-                else:
-                    logger.warning(f"⚠ Code HTTP {response.status_code}")
-            except requests.exceptions.ConnectionError as e:
+                info = self.es.info()
+                logger.info(f"✅ Connecté à Elasticsearch: {self.es_url}")
+                logger.info(f"   Version: {info['version']['number']}")
+                logger.info(f"   Cluster: {info['cluster_name']}")
+                return True
+            except Exception as e:
                 logger.warning(f"⚠ Connexion échouée: {e}")
                 # Essayer localhost si ce n'était pas déjà le cas
                 if self.es_url == 'http://elasticsearch:9200':
                     self.es_url = 'http://localhost:9200'
                     logger.info(f"🔄 Essai avec {self.es_url}")
-            except Exception as e:
-                logger.warning(f"⚠ Erreur: {e}")
-            
+                    self.es = self._new_client()
+
             if attempt < max_retries - 1:
                 wait_time = 2 ** attempt
                 logger.info(f"⏳ Attente de {wait_time}s avant nouvelle tentative...")
@@ -73,20 +281,6 @@ class DataImporterFixed:
         logger.info("   docker compose logs elasticsearch")
         return False
     
-    def generate_unique_id(self, doc, source_file):
-        """Génère un ID unique pour chaque document"""
-        # Utiliser arxiv_id + hash du titre + source pour garantir l'unicité
-        arxiv_id = doc.get('arxiv_id', doc.get('id', ''))
-        title = doc.get('title', '')
-        
-        if arxiv_id and title:
-            # Combiner arxiv_id, hash du titre et source
-            content = f"{arxiv_id}_{hashlib.md5(title.encode()).hexdigest()[:8]}_{source_file}"
-            return hashlib.md5(content.encode()).hexdigest()
-        else:
-            # Fallback: timestamp + random
-            return f"doc_{int(time.time())}_{random.randint(1000, 9999)}"
-    
     def load_all_data(self):
         """Charge toutes les données avec IDs uniques"""
         logger.info("📁 Chargement de toutes les données...")
@@ -110,210 +304,84 @@ class DataImporterFixed:
             logger.error("❌ Dossier data introuvable")
             return []
         
-        # Tous les fichiers JSON disponibles
-        json_patterns = ["*.json", "cleaned/*.json", "raw/*.json"]
-        json_files = []
-        
-        for pattern in json_patterns:
-            try:
-                json_files.extend(list(data_dir.glob(pattern)))
-            except:
-                pass
-        
+        # Tous les fichiers JSON disponibles : un seul parcours récursif,
+        # chemins résolus pour écarter les doublons entre motifs.
+        # Le filtre des fichiers cachés s'applique aux composants sous
+        # data_dir uniquement : un data_dir relatif ("../../data") mettrait
+        # sinon ".." en tête de p.parts et écarterait tous les fichiers
+        json_files = sorted({
+            p.resolve()
+            for pattern in ("*.json", "*.jsonl")
+            for p in data_dir.rglob(pattern)
+            if not any(part.startswith('.') for part in p.relative_to(data_dir).parts)
+        })
+
         logger.info(f"📋 {len(json_files)} fichiers JSON trouvés")
         
         all_documents = []
         seen_content_hashes = set()  # Pour détecter le contenu dupliqué
-        
-        for filepath in json_files:
-            try:
-                file_size = filepath.stat().st_size / 1024  # Taille en KB
-                logger.info(f"  📖 {filepath.name} ({file_size:.1f} KB)")
-                
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                if not isinstance(data, list):
-                    logger.warning(f"    ⚠ Format invalide (attendu liste)")
-                    continue
-                
-                logger.info(f"    ✅ {len(data)} documents")
-                
-                # Traiter chaque document
+        sources = {}  # Histogramme par source, construit au fil de l'eau
+
+        # Parsing + standardisation (CPU pur Python) répartis sur un pool
+        # de processus ; la déduplication reste séquentielle ici
+        worker_args = [(str(p), self.import_ts) for p in json_files]
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for source_name, total_in_file, docs in executor.map(parse_file, worker_args):
+                if len(all_documents) >= self.max_docs:
+                    logger.info(f"📊 Limite de {self.max_docs} documents atteinte")
+                    break
+
+                logger.info(f"  📖 {source_name}")
+                logger.info(f"    ✅ {total_in_file} documents")
+
                 processed = 0
-                for doc in data:
-                    # Standardiser le document
-                    standardized = self.standardize_document(doc, filepath.name)
-                    
-                    if standardized:
-                        # Vérifier le contenu dupliqué (même titre + abstract)
-                        content_hash = hashlib.md5(
-                            f"{standardized['title']}{standardized['abstract']}".encode()
-                        ).hexdigest()
-                        
-                        if content_hash not in seen_content_hashes:
-                            seen_content_hashes.add(content_hash)
-                            
-                            # Générer un ID unique
-                            unique_id = self.generate_unique_id(doc, filepath.name)
-                            standardized['id'] = unique_id
-                            standardized['unique_id'] = unique_id
-                            
-                            all_documents.append(standardized)
-                            processed += 1
-                
+                for standardized in docs:
+                    # Une seule empreinte par document : clé de
+                    # dédup et _id ES à la fois
+                    content_hash = fingerprint(standardized)
+
+                    # Clé entière (8 octets suffisent à 10k docs) : les int
+                    # se hachent et se stockent plus vite dans le set que
+                    # des strings hex ou des bytes
+                    dedup_key = int.from_bytes(content_hash[:8], 'little')
+
+                    if dedup_key not in seen_content_hashes:
+                        seen_content_hashes.add(dedup_key)
+
+                        # L'identifiant ne vit que dans le _id de l'action
+                        # bulk, pas dans le _source ni le mapping
+                        standardized['id'] = content_hash.hex()
+
+                        all_documents.append(standardized)
+                        sources[source_name] = sources.get(source_name, 0) + 1
+                        processed += 1
+
+                        if len(all_documents) >= self.max_docs:
+                            break
+
                 logger.info(f"    ➕ {processed} nouveaux documents uniques")
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"    ❌ Erreur JSON dans {filepath.name}: {e}")
-            except Exception as e:
-                logger.error(f"    ❌ Erreur {filepath.name}: {e}")
-                continue
-        
+
         logger.info(f"📊 Total documents uniques: {len(all_documents)}")
-        
-        # Statistiques
-        if all_documents:
-            sources = {}
-            for doc in all_documents:
-                source = doc.get('import_source', 'unknown')
-                sources[source] = sources.get(source, 0) + 1
-            
+
+        # Statistiques (accumulées pendant le chargement, pas de seconde passe)
+        if sources:
             logger.info("📈 Statistiques par source:")
             for source, count in sorted(sources.items(), key=lambda x: x[1], reverse=True):
                 logger.info(f"   • {source}: {count} documents")
-        
-        return all_documents[:self.max_docs]
-    
-    def standardize_document(self, doc, source_file):
-        """Standardise un document"""
-        try:
-            # Extraire les champs de base
-            title = doc.get('title', doc.get('Title', ''))
-            abstract = doc.get('abstract', doc.get('Abstract', doc.get('summary', '')))
-            
-            if not title or not abstract:
-                return None
-            
-            # Nettoyer
-            title = str(title).strip()
-            abstract = str(abstract).strip()
-            
-            # Vérifier la longueur minimale
-            if len(abstract) < 50:
-                return None
-            
-            # Limiter la longueur de l'abstract
-            if len(abstract) > 5000:
-                abstract = abstract[:5000] + "..."
-            
-            # Extraire arxiv_id
-            arxiv_id = doc.get('arxiv_id', doc.get('id', ''))
-            
-            # Extraire auteurs
-            authors = self.extract_authors(doc)
-            
-            # Extraire catégories
-            categories = self.extract_categories(doc)
-            
-            # Extraire date
-            date_info = self.extract_date_info(doc)
-            
-            return {
-                "title": title,
-                "abstract": abstract,
-                "arxiv_id": arxiv_id,
-                "authors": authors,
-                "categories": categories,
-                "primary_category": categories[0] if categories else "",
-                "date": date_info['date'],
-                "year": date_info['year'],
-                "month": date_info['month'],
-                "source": "arXiv",
-                "import_source": source_file,
-                "import_timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "content_length": len(abstract)
-            }
-            
-        except Exception as e:
-            logger.error(f"❌ Erreur standardisation: {e}")
-            return None
-    
-    def extract_authors(self, doc):
-        """Extrait et nettoie la liste des auteurs"""
-        authors = doc.get('authors', [])
-        if isinstance(authors, list):
-            return [str(a).strip() for a in authors if a]
-        elif isinstance(authors, str):
-            # Essayer de parser
-            try:
-                parsed = json.loads(authors)
-                if isinstance(parsed, list):
-                    return [str(a).strip() for a in parsed if a]
-            except:
-                # Split par virgule
-                return [a.strip() for a in authors.split(',') if a.strip()]
-        return []
-    
-    def extract_categories(self, doc):
-        """Extrait et nettoie les catégories"""
-        categories = doc.get('categories', [])
-        if isinstance(categories, list):
-            return [str(c).strip() for c in categories if c]
-        elif isinstance(categories, str):
-            try:
-                parsed = json.loads(categories)
-                if isinstance(parsed, list):
-                    return [str(c).strip() for c in parsed if c]
-            except:
-                return [c.strip() for c in categories.split(',') if c.strip()]
-        return []
-    
-    def extract_date_info(self, doc):
-        """Extrait les informations de date"""
-        date_str = doc.get('published', doc.get('date', doc.get('publication_date', '')))
-        year = doc.get('year', 2025)
-        month = doc.get('month', 1)
-        
-        if date_str:
-            # Essayer d'extraire YYYY-MM-DD
-            if isinstance(date_str, str) and len(date_str) >= 10:
-                try:
-                    date_part = date_str[:10]
-                    # Vérifier le format
-                    if date_part[4] == '-' and date_part[7] == '-':
-                        year = int(date_part[:4])
-                        month = int(date_part[5:7])
-                        return {
-                            'date': date_part,
-                            'year': year,
-                            'month': month
-                        }
-                except:
-                    pass
-        
-        # Fallback
-        return {
-            'date': f"{year}-{month:02d}-01",
-            'year': year,
-            'month': month
-        }
-    
+
+        return all_documents
+
     def create_index(self):
         """Crée un nouvel index avec mapping optimisé"""
         logger.info(f"📁 Création de l'index '{self.index_name}'...")
         
         # Vérifier si l'index existe déjà
         try:
-            response = requests.get(f"{self.es_url}/{self.index_name}")
-            if response.status_code == 200:
+            if self.es.indices.exists(index=self.index_name):
                 logger.info("🗑️ Index existe déjà, suppression...")
-                response = requests.delete(f"{self.es_url}/{self.index_name}")
-                if response.status_code == 200:
-                    logger.info("✅ Index supprimé")
-                    time.sleep(3)
-                else:
-                    logger.warning(f"⚠ Erreur suppression index: {response.text}")
+                self.es.indices.delete(index=self.index_name)
+                logger.info("✅ Index supprimé")
+                time.sleep(3)
         except Exception as e:
             logger.warning(f"⚠ Erreur vérification index: {e}")
         
@@ -322,8 +390,15 @@ class DataImporterFixed:
             "settings": {
                 "number_of_shards": 1,
                 "number_of_replicas": 0,
-                "refresh_interval": "30s",
+                "refresh_interval": "-1",  # Désactivé pendant l'import, restauré ensuite
                 "max_result_window": 10000,
+                # Translog asynchrone pendant le chargement initial : pas de
+                # fsync par requête bulk ; redevient "request" à la fin
+                "translog": {
+                    "durability": "async",
+                    "sync_interval": "30s",
+                    "flush_threshold_size": "1gb"
+                },
                 "analysis": {
                     "analyzer": {
                         "default": {
@@ -335,8 +410,6 @@ class DataImporterFixed:
             },
             "mappings": {
                 "properties": {
-                    "id": {"type": "keyword"},
-                    "unique_id": {"type": "keyword"},
                     "arxiv_id": {"type": "keyword"},
                     "title": {
                         "type": "text",
@@ -364,107 +437,96 @@ class DataImporterFixed:
         }
         
         try:
-            response = requests.put(
-                f"{self.es_url}/{self.index_name}",
-                json=mapping,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                logger.info("✅ Index créé avec succès")
-                return True
-            else:
-                logger.error(f"❌ Erreur création index: {response.text}")
-                return False
-                
+            self.es.indices.create(index=self.index_name, body=mapping)
+            logger.info("✅ Index créé avec succès")
+            return True
+
         except Exception as e:
             logger.error(f"❌ Exception création index: {e}")
             return False
     
+    def tune_batch_size(self, documents):
+        """Ajuste la taille des lots selon la taille moyenne mesurée des docs.
+
+        Borne fermée : chunk_size <= max_chunk_bytes / taille_moyenne_doc,
+        plutôt qu'un 500 codé en dur.
+        """
+        sample = documents[:64]
+        avg = sum(len(json.dumps(d)) for d in sample) / len(sample)
+        self.batch_size = max(200, min(5000, int(10 * 1024 * 1024 / avg)))
+        logger.info(f"⚙️ Taille moyenne doc: {avg:.0f} octets → batch_size={self.batch_size}")
+
     def import_documents(self, documents):
         """Importe les documents avec IDs uniques"""
         if not documents:
             logger.error("❌ Aucun document à importer")
             return 0
-        
+
+        self.tune_batch_size(documents)
         logger.info(f"🚀 Importation de {len(documents)} documents uniques...")
-        
+
+        # Couper le refresh pendant le bulk (idempotent, l'index est déjà
+        # créé avec refresh_interval=-1)
+        try:
+            self.es.indices.put_settings(
+                index=self.index_name,
+                body={"index": {"refresh_interval": "-1"}}
+            )
+        except Exception as e:
+            logger.warning(f"⚠ Impossible de désactiver le refresh: {e}")
+
         total_imported = 0
+        error_count = 0
         start_time = time.time()
-        batch_count = (len(documents) + self.batch_size - 1) // self.batch_size
-        
-        # Importer par lots
-        progress_bar = tqdm(range(0, len(documents), self.batch_size), 
-                           desc="Importation", unit="batch", total=batch_count)
-        
-        for i in progress_bar:
-            batch = documents[i:i + self.batch_size]
-            
-            # Préparer le bulk
-            bulk_data = []
-            for doc in batch:
-                bulk_data.append(json.dumps({
-                    "index": {
-                        "_index": self.index_name,
-                        "_id": doc["id"]  # ID unique
-                    }
-                }))
-                bulk_data.append(json.dumps(doc))
-            
-            # Convertir en NDJSON
-            ndjson = '\n'.join(bulk_data) + '\n'
-            
-            # Envoyer avec retry
-            max_retries = 3
-            for retry in range(max_retries):
-                try:
-                    response = requests.post(
-                        f"{self.es_url}/_bulk",
-                        data=ndjson,
-                        headers={'Content-Type': 'application/x-ndjson'},
-                        timeout=60
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        if not result.get('errors'):
-                            imported = len(batch)
-                            total_imported += imported
-                            
-                            # Mettre à jour la barre de progression
-                            progress_bar.set_postfix({
-                                "imported": f"{total_imported:,}",
-                                "rate": f"{(total_imported / (time.time() - start_time)):.1f}/s"
-                            })
-                            break
-                        else:
-                            # Compter les succès
-                            success = 0
-                            errors = []
-                            for item in result.get('items', []):
-                                if 'error' in item.get('index', {}):
-                                    errors.append(item['index']['error'])
-                                else:
-                                    success += 1
-                            
-                            total_imported += success
-                            if errors and retry == max_retries - 1:
-                                logger.warning(f"⚠ {len(errors)} erreurs dans le batch")
-                            
-                            break
-                    else:
-                        logger.warning(f"⚠ HTTP {response.status_code} sur le batch")
-                        
-                except Exception as e:
-                    logger.warning(f"⚠ Exception batch (retry {retry + 1}/{max_retries}): {e}")
-                
-                if retry < max_retries - 1:
-                    time.sleep(2 ** retry)  # Exponential backoff
-            
-            # Pause courte entre les batches
-            time.sleep(0.05)
-        
+
+        def gen_actions():
+            # Pas de _index par action : il est hissé au niveau de l'URL
+            # (index=...), ce qui raccourcit chaque ligne d'action du NDJSON.
+            # Le pop retire l'id du _source : il ne voyage que comme _id
+            for doc in documents:
+                yield {
+                    "_id": doc.pop("id"),  # ID unique
+                    "_source": doc
+                }
+
+        # parallel_bulk répartit les requêtes bulk sur un pool de threads,
+        # le retry/backoff est géré par le client (max_retries)
+        progress_bar = tqdm(total=len(documents), desc="Importation", unit="doc")
+
+        for ok, info in parallel_bulk(
+            self.es,
+            gen_actions(),
+            index=self.index_name,
+            thread_count=os.cpu_count() or 2,
+            chunk_size=self.batch_size,
+            max_chunk_bytes=10 * 1024 * 1024,
+            queue_size=4,
+            raise_on_error=False,
+            raise_on_exception=False
+        ):
+            if ok:
+                total_imported += 1
+            else:
+                error_count += 1
+                # Contre-pression ES (429) : souffler brièvement plutôt que
+                # marteler le cluster ; tout autre cas continue immédiatement
+                status = info.get('index', {}).get('status') if isinstance(info, dict) else None
+                if status == 429:
+                    time.sleep(1)
+                if error_count <= 5:
+                    logger.warning(f"⚠ Erreur d'indexation: {info}")
+
+            progress_bar.update(1)
+            if total_imported % 1000 == 0:
+                progress_bar.set_postfix({
+                    "imported": f"{total_imported:,}",
+                    "rate": f"{(total_imported / (time.time() - start_time)):.1f}/s"
+                })
+
         progress_bar.close()
+
+        if error_count:
+            logger.warning(f"⚠ {error_count} erreurs d'indexation au total")
         
         elapsed = time.time() - start_time
         rate = total_imported / elapsed if elapsed > 0 else 0
@@ -482,101 +544,94 @@ class DataImporterFixed:
         time.sleep(3)  # Attendre l'indexation
         
         try:
+            # Restaurer le refresh périodique et la durabilité sûre du
+            # translog maintenant que l'import est fini
+            self.es.indices.put_settings(
+                index=self.index_name,
+                body={"index": {
+                    "refresh_interval": "30s",
+                    "translog": {"durability": "request"}
+                }}
+            )
+
             # Rafraîchir l'index
-            response = requests.post(f"{self.es_url}/{self.index_name}/_refresh", timeout=10)
-            if response.status_code != 200:
-                logger.warning("⚠ Rafraîchissement échoué")
-            
+            self.es.indices.refresh(index=self.index_name)
+
             # Compter les documents
-            response = requests.get(f"{self.es_url}/{self.index_name}/_count", timeout=10)
-            if response.status_code == 200:
-                count = response.json().get('count', 0)
-                logger.info(f"📊 Documents dans l'index: {count:,}")
-                
-                if count == 0:
-                    logger.error("❌ L'index est vide!")
-                    return False
-                
-                # Statistiques détaillées
-                stats_query = {
-                    "size": 0,
-                    "aggs": {
-                        "sources": {
-                            "terms": {
-                                "field": "import_source.keyword",
-                                "size": 10
-                            }
-                        },
-                        "top_categories": {
-                            "terms": {
-                                "field": "categories.keyword",
-                                "size": 10
-                            }
-                        },
-                        "years": {
-                            "terms": {
-                                "field": "year",
-                                "size": 10,
-                                "order": {"_key": "desc"}
-                            }
+            count = self.es.count(index=self.index_name).get('count', 0)
+            logger.info(f"📊 Documents dans l'index: {count:,}")
+
+            if count == 0:
+                logger.error("❌ L'index est vide!")
+                return False
+
+            # Statistiques détaillées
+            stats_query = {
+                "size": 0,
+                "aggs": {
+                    "sources": {
+                        "terms": {
+                            "field": "import_source.keyword",
+                            "size": 10
                         }
-                    }
-                }
-                
-                response = requests.post(
-                    f"{self.es_url}/{self.index_name}/_search",
-                    json=stats_query,
-                    timeout=15
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    logger.info("📁 Sources des documents:")
-                    sources = data.get('aggregations', {}).get('sources', {}).get('buckets', [])
-                    for bucket in sources[:5]:
-                        logger.info(f"   • {bucket['key']}: {bucket['doc_count']}")
-                    
-                    logger.info("🏷️  Catégories principales:")
-                    categories = data.get('aggregations', {}).get('top_categories', {}).get('buckets', [])
-                    for bucket in categories[:5]:
-                        logger.info(f"   • {bucket['key']}: {bucket['doc_count']}")
-                    
-                    logger.info("📅 Distribution par année:")
-                    years = data.get('aggregations', {}).get('years', {}).get('buckets', [])
-                    for bucket in years:
-                        logger.info(f"   • {bucket['key']}: {bucket['doc_count']}")
-                
-                # Tester une recherche
-                test_query = {
-                    "query": {
-                        "match": {
-                            "title": "machine learning"
+                    },
+                    "top_categories": {
+                        "terms": {
+                            "field": "categories.keyword",
+                            "size": 10
                         }
                     },
-                    "size": 1
+                    "years": {
+                        "terms": {
+                            "field": "year",
+                            "size": 10,
+                            "order": {"_key": "desc"}
+                        }
+                    }
                 }
-                
-                response = requests.post(
-                    f"{self.es_url}/{self.index_name}/_search",
-                    json=test_query,
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    test_data = response.json()
-                    total = test_data['hits']['total']['value']
-                    took = test_data['took']
-                    logger.info(f"🔍 Test recherche 'machine learning':")
-                    logger.info(f"   • Résultats: {total:,}")
-                    logger.info(f"   • Temps: {took}ms")
-                    
-                    if test_data['hits']['hits']:
-                        doc = test_data['hits']['hits'][0]['_source']
-                        logger.info(f"📄 Exemple: {doc.get('title', '')[:60]}...")
-                
-                return True
-                
+            }
+
+            data = self.es.search(index=self.index_name, body=stats_query)
+
+            logger.info("📁 Sources des documents:")
+            sources = data.get('aggregations', {}).get('sources', {}).get('buckets', [])
+            for bucket in sources[:5]:
+                logger.info(f"   • {bucket['key']}: {bucket['doc_count']}")
+
+            logger.info("🏷️  Catégories principales:")
+            categories = data.get('aggregations', {}).get('top_categories', {}).get('buckets', [])
+            for bucket in categories[:5]:
+                logger.info(f"   • {bucket['key']}: {bucket['doc_count']}")
+
+            logger.info("📅 Distribution par année:")
+            years = data.get('aggregations', {}).get('years', {}).get('buckets', [])
+            for bucket in years:
+                logger.info(f"   • {bucket['key']}: {bucket['doc_count']}")
+
+            # Tester une recherche
+            test_query = {
+                "query": {
+                    "match": {
+                        "title": "machine learning"
+                    }
+                },
+                "size": 1
+            }
+
+            test_data = self.es.search(index=self.index_name, body=test_query)
+
+            total = test_data['hits']['total']['value']
+            took = test_data['took']
+            logger.info(f"🔍 Test recherche 'machine learning':")
+            logger.info(f"   • Résultats: {total:,}")
+            logger.info(f"   • Temps: {took}ms")
+
+            if test_data['hits']['hits']:
+                doc = test_data['hits']['hits'][0]['_source']
+                logger.info(f"📄 Exemple: {doc.get('title', '')[:60]}...")
+
+            return True
+
         except Exception as e:
             logger.error(f"❌ Erreur vérification: {e}")
             return False
@@ -586,27 +641,28 @@ class DataImporterFixed:
         logger.info("🔧 Optimisation de l'index...")
         
         try:
-            # Fusionner les segments pour meilleure performance
-            response = requests.post(
-                f"{self.es_url}/{self.index_name}/_forcemerge?max_num_segments=1",
-                timeout=120
-            )
-            
-            if response.status_code == 200:
+            if self.do_forcemerge:
+                # max_num_segments=5 plutôt que 1 : quelques segments
+                # suffisent à cette échelle et on évite la réécriture
+                # mono-thread du pire cas
+                self.es.indices.forcemerge(
+                    index=self.index_name,
+                    max_num_segments=5,
+                    request_timeout=120
+                )
                 logger.info("✅ Fusion des segments terminée")
             else:
-                logger.warning(f"⚠ Fusion échouée: {response.status_code}")
-            
+                logger.info("⏭ Forcemerge ignoré (ES_FORCEMERGE=1 pour l'activer) — "
+                            "les merges d'arrière-plan suffisent à cette taille d'index")
+
             # Statistiques de stockage
-            response = requests.get(f"{self.es_url}/{self.index_name}/_stats/store", timeout=10)
-            if response.status_code == 200:
-                stats = response.json()
-                size_bytes = stats['indices'][self.index_name]['total']['store']['size_in_bytes']
-                size_mb = size_bytes / (1024*1024)
-                logger.info(f"💾 Taille index: {size_mb:.1f} MB")
-            
+            stats = self.es.indices.stats(index=self.index_name, metric="store")
+            size_bytes = stats['indices'][self.index_name]['total']['store']['size_in_bytes']
+            size_mb = size_bytes / (1024*1024)
+            logger.info(f"💾 Taille index: {size_mb:.1f} MB")
+
             return True
-            
+
         except Exception as e:
             logger.error(f"❌ Erreur optimisation: {e}")
             return False
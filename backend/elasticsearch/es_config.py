@@ -1,45 +1,68 @@
 import os
 from elasticsearch import Elasticsearch, ElasticsearchWarning
-from dotenv import load_dotenv
 import logging
 import warnings
 
+try:
+    from backend.elasticsearch._env import load as load_env
+except ImportError:
+    from _env import load as load_env
+
 # Supprimer les warnings Elasticsearch
 warnings.filterwarnings("ignore", category=ElasticsearchWarning)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+# Gabarit constant des kwargs client, copié au lieu d'être reconstruit
+# littéral par littéral à chaque appel
+_BASE_ES_KWARGS = {
+    'request_timeout': 30,
+    'max_retries': 3,
+    'retry_on_timeout': True,
+    'verify_certs': False,  # Important pour développement
+    'ssl_show_warn': False,
+    'http_compress': True,
+}
 
 class ElasticsearchConfig:
     """Configuration pour la connexion Elasticsearch"""
-    
+
     def __init__(self):
-        self.host = os.getenv('ELASTICSEARCH_HOST', 'localhost')
-        self.port = int(os.getenv('ELASTICSEARCH_PORT', 9200))
-        self.scheme = os.getenv('ELASTICSEARCH_SCHEME', 'http')
-        self.username = os.getenv('ELASTICSEARCH_USERNAME', '')
-        self.password = os.getenv('ELASTICSEARCH_PASSWORD', '')
-        self.index_name = os.getenv('ELASTICSEARCH_INDEX', 'arxiv_papers')
+        # .env n'est parsé qu'une fois, l'instantané est partagé
+        env = load_env()
+        self.host = env.get('ELASTICSEARCH_HOST') or 'localhost'
+        self.port = int(env.get('ELASTICSEARCH_PORT') or 9200)
+        self.scheme = env.get('ELASTICSEARCH_SCHEME') or 'http'
+        self.username = env.get('ELASTICSEARCH_USERNAME') or ''
+        self.password = env.get('ELASTICSEARCH_PASSWORD') or ''
+        self.index_name = env.get('ELASTICSEARCH_INDEX') or 'arxiv_papers'
         self.embedding_dim = 384
-        
+        # Réglages bulk consommés par les importateurs
+        # (helpers.*_bulk(chunk_size=..., max_chunk_bytes=...))
+        self.pool_size = int(os.getenv('ES_POOL_SIZE', '32'))
+        self.bulk_chunk_size = int(os.getenv('ES_BULK_CHUNK', '2000'))
+        self.bulk_max_bytes = int(os.getenv('ES_BULK_BYTES', str(10 * 1024 * 1024)))
+        self._client = None
+
     def get_client(self):
-        """Retourne une instance du client Elasticsearch"""
+        """Retourne le client Elasticsearch partagé (créé une seule fois)"""
+        # Un seul client = un seul pool de connexions ; en recréer un à
+        # chaque appel multiplie les handshakes TCP/TLS
+        if self._client is not None:
+            return self._client
+
         try:
             # URL de connexion
             hosts = [f"{self.scheme}://{self.host}:{self.port}"]
             logger.info(f"🔗 Tentative de connexion à: {hosts[0]}")
             
-            # Configuration du client
-            es_kwargs = {
-                'hosts': hosts,
-                'request_timeout': 30,
-                'max_retries': 3,
-                'retry_on_timeout': True,
-                'verify_certs': False,  # Important pour développement
-                'ssl_show_warn': False,
-            }
+            # Configuration du client : gabarit constant + valeurs dynamiques
+            es_kwargs = dict(
+                _BASE_ES_KWARGS,
+                hosts=hosts,
+                connections_per_node=self.pool_size,  # Déblocage des requêtes concurrentes
+            )
             
             # Ajouter l'authentification si configurée
             if self.username and self.password:
@@ -47,27 +70,17 @@ class ElasticsearchConfig:
             
             # Créer le client
             client = Elasticsearch(**es_kwargs)
-            
-            # Tester la connexion avec info() au lieu de ping()
-            try:
-                info = client.info()
-                logger.info(f"✅ Connecté à Elasticsearch {info['version']['number']}")
-                logger.info(f"   Cluster: {info['cluster_name']}")
-                return client
-            except Exception as ping_error:
-                logger.warning(f"⚠ client.info() échoué: {ping_error}")
-                
-                # Essayer une autre méthode de test
-                try:
-                    # Tester avec une requête GET simple
-                    response = client.perform_request('GET', '/')
-                    if response.status_code == 200:
-                        logger.info("✅ Connexion testée avec perform_request")
-                        return client
-                except Exception as e2:
-                    logger.error(f"❌ Toutes les méthodes de test ont échoué: {e2}")
-                    return None
-                
+
+            # Tester la connexion avec ping() : une requête HEAD,
+            # pas de payload JSON à télécharger ni à décoder
+            if not client.ping():
+                logger.error("❌ Elasticsearch ne répond pas au ping")
+                return None
+
+            logger.info(f"✅ Connecté à Elasticsearch sur {hosts[0]}")
+            self._client = client
+            return client
+
         except Exception as e:
             logger.error(f"❌ Erreur création client Elasticsearch: {e}")
             return None
@@ -1,34 +1,63 @@
-import os
 from elasticsearch import Elasticsearch
-from dotenv import load_dotenv
 import logging
-import requests
+import socket
+import time
+
+try:
+    from backend.elasticsearch._env import load as load_env
+except ImportError:
+    from _env import load as load_env
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+# Gabarit constant des kwargs client, copié au lieu d'être reconstruit
+# littéral par littéral à chaque appel
+_BASE_ES_KWARGS = {
+    'verify_certs': False,
+    'ssl_show_warn': False,
+    'request_timeout': 60,
+    'max_retries': 10,
+    'retry_on_timeout': True,
+    'connections_per_node': 32,  # Déblocage des requêtes concurrentes
+    'http_compress': True,
+}
 
 class ElasticsearchConfigFixed:
     """Configuration fixée pour Elasticsearch 8.x"""
-    
+
     def __init__(self, force_no_auth=True):
-        self.host = os.getenv('ELASTICSEARCH_HOST', 'localhost')
-        self.port = int(os.getenv('ELASTICSEARCH_PORT', 9200))
-        self.index_name = os.getenv('ELASTICSEARCH_INDEX', 'arxiv_papers')
+        # .env n'est parsé qu'une fois, l'instantané est partagé
+        env = load_env()
+        self.host = env.get('ELASTICSEARCH_HOST') or 'localhost'
+        self.port = int(env.get('ELASTICSEARCH_PORT') or 9200)
+        self.index_name = env.get('ELASTICSEARCH_INDEX') or 'arxiv_papers'
         self.force_no_auth = force_no_auth
-        
+        self._client = None
+
     def check_es_available(self):
-        """Vérifie si Elasticsearch répond via HTTP simple"""
-        try:
-            url = f"http://{self.host}:{self.port}"
-            response = requests.get(url, timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        """Vérifie si le port Elasticsearch accepte les connexions.
+
+        Un simple connect TCP suffit pour la détection de vivacité :
+        pas besoin de monter toute la pile HTTP juste pour un booléen.
+        Des tentatives courtes et bornées tolèrent le démarrage de
+        docker compose sans jamais bloquer plus d'une poignée de secondes.
+        """
+        for _ in range(10):
+            try:
+                socket.create_connection((self.host, self.port), timeout=0.3).close()
+                return True
+            except OSError:
+                time.sleep(0.1)
+        return False
     
     def get_client(self):
-        """Retourne un client Elasticsearch qui fonctionne"""
+        """Retourne le client Elasticsearch partagé (créé une seule fois)"""
+        # Un seul client = un seul pool de connexions ; en recréer un à
+        # chaque appel multiplie les handshakes TCP/TLS
+        if self._client is not None:
+            return self._client
+
         # D'abord vérifier qu'ES est disponible
         if not self.check_es_available():
             logger.error(f"❌ Elasticsearch non disponible sur http://{self.host}:{self.port}")
@@ -37,15 +66,12 @@ class ElasticsearchConfigFixed:
         
         logger.info(f"✅ Elasticsearch disponible sur http://{self.host}:{self.port}")
         
-        # Configuration pour contourner les problèmes de sécurité
-        es_config = {
-            'hosts': [f"http://{self.host}:{self.port}"],
-            'verify_certs': False,
-            'ssl_show_warn': False,
-            'request_timeout': 60,
-            'max_retries': 10,
-            'retry_on_timeout': True,
-        }
+        # Configuration pour contourner les problèmes de sécurité :
+        # gabarit constant + hôte dynamique
+        es_config = dict(
+            _BASE_ES_KWARGS,
+            hosts=[f"http://{self.host}:{self.port}"],
+        )
         
         # Pour ES 8.x avec sécurité désactivée
         if self.force_no_auth:
@@ -53,33 +79,14 @@ class ElasticsearchConfigFixed:
         
         try:
             client = Elasticsearch(**es_config)
-            
-            # Tester avec une méthode simple
-            try:
-                # Essayer d'abord sans authentification
-                info = client.info(request_timeout=10)
-                logger.info(f"✅ Connecté à Elasticsearch {info['version']['number']}")
-                return client
-            except Exception as auth_error:
-                logger.warning(f"⚠ Premier essai échoué: {auth_error}")
-                
-                # Essayer avec des paramètres différents
-                es_config_simple = {
-                    'hosts': [f"http://{self.host}:{self.port}"],
-                    'verify_certs': False,
-                    'request_timeout': 30,
-                }
-                
-                client_simple = Elasticsearch(**es_config_simple)
-                
-                try:
-                    info = client_simple.info()
-                    logger.info(f"✅ Connecté (méthode simple) à ES {info['version']['number']}")
-                    return client_simple
-                except Exception as e:
-                    logger.error(f"❌ Toutes les méthodes ont échoué: {e}")
-                    return None
-                    
+
+            # Tester avec une méthode simple ; les retries/timeouts du
+            # client suffisent, inutile d'en construire un deuxième
+            info = client.info(request_timeout=10)
+            logger.info(f"✅ Connecté à Elasticsearch {info['version']['number']}")
+            self._client = client
+            return client
+
         except Exception as e:
             logger.error(f"❌ Impossible de créer le client: {e}")
             return None
@@ -2,49 +2,55 @@
 """
 Script maître pour le pipeline de données dans Docker.
 Exécute le nettoyage, l'enrichissement et l'importation.
+Les étapes tournent dans le même interpréteur : pas de redémarrage
+Python par étape, les modules lourds (numpy, client ES) ne sont
+chargés qu'une fois.
 """
-import subprocess
 import sys
 import os
+from pathlib import Path
 
-def run_script(script_name, args=""):
-    """Exécute un script Python et retourne True en cas de succès."""
-    script_path = f"/app/data/scripts/{script_name}"
-    if os.path.exists(script_path):
-        print(f"▶ Exécution de {script_name}...")
-        result = subprocess.run([sys.executable, script_path] + args.split(), capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"  ✅ {script_name} terminé avec succès")
-            return True
-        else:
-            print(f"  ❌ Erreur avec {script_name}: {result.stderr}")
+# Ajouter le chemin parent pour importer les modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent.absolute()
+sys.path.append(str(PROJECT_ROOT))
+
+def run_step(step_name, step_func):
+    """Exécute une étape du pipeline et retourne True en cas de succès."""
+    print(f"▶ Exécution de {step_name}...")
+    try:
+        step_func()
+    except SystemExit as e:
+        # Certaines étapes (data_importer.main) se terminent par
+        # sys.exit : traduire le code de sortie en succès/échec au lieu
+        # de laisser l'exception tuer le pipeline entier
+        if e.code not in (0, None):
+            print(f"  ❌ {step_name} s'est terminé avec le code {e.code}")
             return False
-    else:
-        print(f"  ⚠ Script non trouvé: {script_path}")
+    except Exception as e:
+        print(f"  ❌ Erreur avec {step_name}: {e}")
         return False
+    print(f"  ✅ {step_name} terminé avec succès")
+    return True
 
 def main():
     print("🚀 DÉMARRAGE DU PIPELINE DE DONNÉES DOCKER")
     print("=" * 50)
 
+    from data.scripts.clean_data import main as clean_main
+    from data.scripts.enhance_data import enhance_arxiv_data
+    from backend.elasticsearch.data_importer import main as import_main
+
     # 1. Nettoyer les données (depuis les fichiers .json et .xml bruts)
-    if not run_script("clean_data.py"):
+    if not run_step("clean_data", clean_main):
         print("Le nettoyage a échoué, poursuite avec les données existantes...")
 
     # 2. Enrichir les données nettoyées
-    if not run_script("enhance_data.py"):
+    if not run_step("enhance_data", enhance_arxiv_data):
         print("L'enrichissement a échoué, poursuite avec les données nettoyées...")
 
     # 3. Exécuter l'importateur principal (pointant vers le fichier enrichi)
-    print("▶ Exécution de l'importateur principal...")
-    os.chdir("/app/backend/elasticsearch")
-    result = subprocess.run([sys.executable, "data_importer.py"], capture_output=True, text=True)
-    if result.returncode == 0:
-        print("✅ Importateur principal terminé avec succès")
-        print(result.stdout)
-    else:
-        print("❌ L'importateur principal a échoué")
-        print(result.stderr)
+    os.chdir(PROJECT_ROOT / "backend" / "elasticsearch")
+    if not run_step("importateur principal", import_main):
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -1,26 +1,22 @@
-with open('backend/api/routes_simple.py', 'r') as f:
-    lines = f.readlines()
+import re
+
+# Une seule alternation compilée couvre les quatre motifs ; le fichier
+# est traité en un seul passage au lieu de quatre scans par ligne
+_URL_RE = re.compile(r'(f?)(["\'])ELASTICSEARCH_URL(/|\2)')
 
-for i in range(len(lines)):
-    line = lines[i]
-    
-    # 1. Corriger "ELASTICSEARCH_URL" seul (ligne 224)
-    if '"ELASTICSEARCH_URL"' in line:
-        lines[i] = line.replace('"ELASTICSEARCH_URL"', 'ELASTICSEARCH_URL')
-    
-    # 2. Corriger "ELASTICSEARCH_URL/..." (fichier comme ligne 292)
-    elif '"ELASTICSEARCH_URL/' in line:
-        lines[i] = line.replace('"ELASTICSEARCH_URL/', 'f"{ELASTICSEARCH_URL}/')
-    
-    # 3. Corriger f"ELASTICSEARCH_URL/... (ligne 469, 784)
-    elif 'f"ELASTICSEARCH_URL/' in line:
-        lines[i] = line.replace('f"ELASTICSEARCH_URL/', 'f"{ELASTICSEARCH_URL}/')
-    
-    # 4. Corriger 'ELASTICSEARCH_URL/... (si présent)
-    elif "'ELASTICSEARCH_URL/" in line:
-        lines[i] = line.replace("'ELASTICSEARCH_URL/", "f'{ELASTICSEARCH_URL}/")
+def _fix(match):
+    quote = match.group(2)
+    tail = match.group(3)
+    if tail == '/':
+        # "ELASTICSEARCH_URL/... ou f"ELASTICSEARCH_URL/... -> f-string interpolée
+        return f'f{quote}{{ELASTICSEARCH_URL}}/'
+    # "ELASTICSEARCH_URL" seul -> référence directe à la variable
+    return 'ELASTICSEARCH_URL'
+
+with open('backend/api/routes_simple.py', 'r') as f:
+    source = f.read()
 
 with open('backend/api/routes_simple.py', 'w') as f:
-    f.writelines(lines)
+    f.write(_URL_RE.sub(_fix, source))
 
 print("✅ Corrections appliquées !")
@@ -4,9 +4,13 @@ Nettoie les données arXiv téléchargées.
 Convertit les fichiers XML bruts en JSON nettoyé.
 """
 
-import json
+import ijson
+import orjson
+import os
+from collections import Counter
 from pathlib import Path
-import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree
 import re
 
 # ----------------------------------------------------------
@@ -20,7 +24,11 @@ CLEANED_DIR = DATA_DIR / "cleaned"
 # Créer le répertoire cleaned s'il n'existe pas
 CLEANED_DIR.mkdir(parents=True, exist_ok=True)
 
-OUTPUT_FILE = CLEANED_DIR / "cleaned_cs.json"
+# JSON Lines : un document par ligne, écrit au fil de l'eau
+OUTPUT_FILE = CLEANED_DIR / "cleaned_cs.jsonl"
+
+# Regex précompilée : \s couvre déjà \n, \r et \t, une seule passe suffit
+_WS_RE = re.compile(r'\s+')
 
 def clean_text(text):
     """
@@ -28,66 +36,68 @@ def clean_text(text):
     """
     if not text:
         return ""
-    
-    # Remplacer les sauts de ligne et retours chariot
-    text = text.replace('\n', ' ').replace('\r', ' ')
-    
-    # Remplacer les espaces multiples par un seul espace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Supprimer les espaces en début et fin
-    text = text.strip()
-    
-    return text
+
+    # Une seule passe regex remplace les trois parcours précédents
+    return _WS_RE.sub(' ', text).strip()
 
 def clean_arxiv_xml(file_path):
     """
-    Nettoie un fichier XML ArXiv.
+    Nettoie un fichier XML ArXiv en flux avec lxml.iterparse.
+    Chaque entrée est traitée dès qu'elle est parsée puis libérée,
+    la mémoire reste constante quelle que soit la taille du dump.
     """
+    # Namespace pour arXiv, pré-étendu en notation Clark : les tags sont
+    # construits une fois hors boucle au lieu d'une f-string par find
+    ATOM = "{http://www.w3.org/2005/Atom}"
+    TAG_ENTRY = ATOM + "entry"
+    TAG_TITLE = ATOM + "title"
+    TAG_SUMMARY = ATOM + "summary"
+    TAG_ID = ATOM + "id"
+    TAG_AUTHOR = ATOM + "author"
+    TAG_NAME = ATOM + "name"
+    TAG_CATEGORY = ATOM + "category"
+    TAG_PUBLISHED = ATOM + "published"
+    src_name = file_path.name
+
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
         docs = []
-        
-        # Namespace pour arXiv
-        ns = {"atom": "http://www.w3.org/2005/Atom"}
-        
-        entries = root.findall("atom:entry", ns)
-        print(f"    {len(entries)} entrées trouvées")
-        
-        for entry in entries:
+        context = etree.iterparse(
+            str(file_path), events=("end",), tag=TAG_ENTRY
+        )
+
+        for _, entry in context:
             try:
                 # Titre
-                title_elem = entry.find("atom:title", ns)
+                title_elem = entry.find(TAG_TITLE)
                 title = clean_text(title_elem.text) if title_elem is not None and title_elem.text else ""
-                
+
                 # Résumé
-                summary_elem = entry.find("atom:summary", ns)
+                summary_elem = entry.find(TAG_SUMMARY)
                 abstract = clean_text(summary_elem.text) if summary_elem is not None and summary_elem.text else ""
-                
+
                 # ID arXiv
-                id_elem = entry.find("atom:id", ns)
+                id_elem = entry.find(TAG_ID)
                 arxiv_id = ""
                 if id_elem is not None and id_elem.text:
                     arxiv_id = id_elem.text.split("/")[-1].split("v")[0]
-                
+
                 # Auteurs
                 authors = []
-                for author in entry.findall("atom:author", ns):
-                    name_elem = author.find("atom:name", ns)
+                for author in entry.findall(TAG_AUTHOR):
+                    name_elem = author.find(TAG_NAME)
                     if name_elem is not None and name_elem.text:
                         authors.append(clean_text(name_elem.text))
-                
+
                 # Catégories
                 categories = []
-                for category in entry.findall("atom:category", ns):
+                for category in entry.findall(TAG_CATEGORY):
                     if category.get("term"):
                         categories.append(category.get("term"))
-                
+
                 # Date de publication
-                published_elem = entry.find("atom:published", ns)
+                published_elem = entry.find(TAG_PUBLISHED)
                 published = published_elem.text if published_elem is not None else ""
-                
+
                 if title and abstract and len(abstract) > 50:  # Ne garder que les documents complets
                     doc = {
                         "arxiv_id": arxiv_id,
@@ -96,14 +106,19 @@ def clean_arxiv_xml(file_path):
                         "authors": authors,
                         "categories": categories,
                         "published": published,
-                        "source_file": file_path.name
+                        "source_file": src_name
                     }
                     docs.append(doc)
-                    
+
             except Exception as e:
                 print(f"    ⚠ Erreur avec une entrée: {e}")
-                continue
-        
+            finally:
+                # Libérer l'entrée et les frères précédents déjà traités
+                entry.clear()
+                while entry.getprevious() is not None:
+                    del entry.getparent()[0]
+
+        print(f"    {len(docs)} entrées retenues")
         return docs
     except Exception as e:
         print(f"❌ Erreur avec {file_path.name}: {e}")
@@ -135,41 +150,49 @@ def create_sample_data():
         }
     ]
     
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(sample_docs, f, indent=2, ensure_ascii=False)
-    
+    with open(OUTPUT_FILE, "wb") as f:
+        for doc in sample_docs:
+            f.write(orjson.dumps(doc))
+            f.write(b"\n")
+
     print(f"✅ Données d'exemple créées: {OUTPUT_FILE}")
     return sample_docs
 
 def clean_from_json(input_file):
     """
     Nettoie les données à partir d'un fichier JSON déjà téléchargé.
+    Le fichier est parsé en flux avec ijson : la liste complète n'est
+    jamais matérialisée, la mémoire reste constante même sur 100 Mo+.
     """
     try:
         print(f"  Lecture de {input_file.name}...")
-        with open(input_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
+
         cleaned_docs = []
-        
-        for i, doc in enumerate(data):
-            if isinstance(doc, dict):
-                # Extraire les champs nécessaires
-                title = clean_text(doc.get("title", doc.get("Title", "")))
-                abstract = clean_text(doc.get("abstract", doc.get("abstract", doc.get("summary", ""))))
-                arxiv_id = doc.get("arxiv_id", doc.get("id", f"doc_{i}"))
-                authors = doc.get("authors", [])
-                categories = doc.get("categories", [])
-                published = doc.get("published", "")
-                
-                if title and abstract and len(abstract) > 50:
+
+        with open(input_file, "rb") as f:
+            for i, doc in enumerate(ijson.items(f, "item")):
+                if isinstance(doc, dict):
+                    # Filtrer d'abord sur titre/résumé : inutile d'extraire
+                    # les autres champs pour un document qui sera rejeté
+                    title = clean_text(doc.get("title", doc.get("Title", "")))
+                    if not title:
+                        continue
+                    abstract = clean_text(doc.get("abstract", doc.get("abstract", doc.get("summary", ""))))
+                    if len(abstract) <= 50:
+                        continue
+
+                    authors = doc.get("authors", [])
+                    categories = doc.get("categories", [])
                     cleaned_docs.append({
-                        "arxiv_id": arxiv_id,
+                        "arxiv_id": doc.get("arxiv_id", doc.get("id", f"doc_{i}")),
                         "title": title,
                         "abstract": abstract,
                         "authors": authors if isinstance(authors, list) else [],
-                        "categories": categories if isinstance(categories, list) else [],
-                        "published": published
+                        # Normaliser en list[str] dès l'écriture : l'aval
+                        # n'a plus à re-vérifier les types
+                        "categories": [c for c in categories if isinstance(c, str)]
+                        if isinstance(categories, list) else [],
+                        "published": doc.get("published", "")
                     })
         
         print(f"✅ Nettoyé {len(cleaned_docs)} documents depuis {input_file.name}")
@@ -194,12 +217,13 @@ def main():
     
     if xml_files:
         print(f"📁 Trouvé {len(xml_files)} fichiers XML dans {RAW_DIR}")
-        
-        for xml_file in xml_files:
-            print(f"  Traitement de {xml_file.name}...")
-            docs = clean_arxiv_xml(xml_file)
-            all_docs.extend(docs)
-            print(f"    {len(docs)} documents extraits")
+
+        # Chaque fichier est un travail CPU indépendant (parsing + regex) :
+        # on les répartit sur tous les cœurs
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for xml_file, docs in zip(xml_files, executor.map(clean_arxiv_xml, xml_files)):
+                all_docs.extend(docs)
+                print(f"  {xml_file.name}: {len(docs)} documents extraits")
     
     # Option 2: Vérifier si un fichier JSON existe déjà (arxiv_cs.json)
     json_file = DATA_DIR / "arxiv_cs.json"
@@ -218,51 +242,54 @@ def main():
             all_docs.extend(simplified_docs)
     
     if all_docs:
-        # Supprimer les doublons basés sur arXiv_id
-        unique_docs = []
+        # Déduplication (par arxiv_id), statistiques et écriture JSON Lines
+        # en une seule passe : seuls le set d'ids et quelques exemples
+        # restent en mémoire, chaque document est écrit puis oublié
         seen_ids = set()
-        
-        for doc in all_docs:
-            doc_id = doc.get("arxiv_id", "")
-            if doc_id and doc_id not in seen_ids:
-                seen_ids.add(doc_id)
-                unique_docs.append(doc)
-        
-        print(f"\n📊 Après déduplication: {len(unique_docs)} documents uniques")
-        
-        # Statistiques par catégorie
-        category_stats = {}
-        for doc in unique_docs:
-            for cat in doc.get("categories", []):
-                if isinstance(cat, str) and cat.startswith("cs."):
-                    category_stats[cat] = category_stats.get(cat, 0) + 1
-        
+        category_stats = Counter()
+        examples = []
+        n_unique = 0
+
+        with open(OUTPUT_FILE, "wb") as f:
+            for doc in all_docs:
+                doc_id = doc.get("arxiv_id", "")
+                if doc_id and doc_id not in seen_ids:
+                    seen_ids.add(doc_id)
+                    n_unique += 1
+                    # Les catégories sont normalisées en list[str] en amont
+                    category_stats.update(
+                        cat for cat in doc.get("categories", ())
+                        if cat.startswith("cs.")
+                    )
+                    f.write(orjson.dumps(doc))
+                    f.write(b"\n")
+                    if len(examples) < 3:
+                        examples.append(doc)
+
+        print(f"\n📊 Après déduplication: {n_unique} documents uniques")
+
         print("\n📈 Répartition par catégorie (top 10):")
-        for cat, count in sorted(category_stats.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for cat, count in category_stats.most_common(10):
             print(f"   {cat}: {count} articles")
-        
-        # Sauvegarder
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(unique_docs, f, indent=2, ensure_ascii=False)
-        
-        print(f"\n✅ {len(unique_docs)} documents nettoyés et sauvegardés")
+
+        print(f"\n✅ {n_unique} documents nettoyés et sauvegardés")
         print(f"📁 Fichier de sortie: {OUTPUT_FILE}")
-        
+
         # Afficher quelques exemples
         print("\n📋 Exemples de documents nettoyés:")
-        for i, doc in enumerate(unique_docs[:3]):
+        for i, doc in enumerate(examples):
             print(f"   {i+1}. {doc['title'][:60]}...")
             print(f"      ID: {doc.get('arxiv_id', 'N/A')}")
             print(f"      Catégories: {', '.join(doc.get('categories', [])[:3])}")
             print()
-        
-        return unique_docs
-        
+
+        return n_unique
+
     else:
         print(f"⚠ Aucun document nettoyé")
         print("💡 Création de données d'exemple...")
-        return create_sample_data()
+        return len(create_sample_data())
 
 if __name__ == "__main__":
     result = main()
-    print(f"\n✨ Nettoyage terminé! {len(result) if result else 0} documents disponibles.")
+    print(f"\n✨ Nettoyage terminé! {result or 0} documents disponibles.")
@@ -4,11 +4,25 @@ Télécharge les articles scientifiques de l'API arXiv.
 Permet de télécharger par lots avec gestion d'erreurs robuste.
 """
 
+import io
 import os
-import json
+import orjson
 import time
+import threading
 import requests
+from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
+
+# lxml si disponible : parseur C, nettement plus rapide et plus sobre
+# en mémoire que ElementTree ; repli silencieux sur la stdlib sinon
+try:
+    from lxml import etree as LET
+    _PARSE_ERRORS = (ET.ParseError, LET.XMLSyntaxError)
+except ImportError:
+    LET = None
+    _PARSE_ERRORS = (ET.ParseError,)
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 import sys
@@ -21,9 +35,6 @@ DATA_DIR = PROJECT_ROOT / "data"
 RAW_DIR = DATA_DIR / "raw"
 OUTPUT_FILE = DATA_DIR / "arxiv_cs.json"
 
-# Créer les répertoires si nécessaire
-RAW_DIR.mkdir(parents=True, exist_ok=True)
-
 # ----------------------------------------------------------
 # Paramètres de l'API arXiv
 # ----------------------------------------------------------
@@ -32,138 +43,221 @@ TOTAL_RESULTS = 500  # Réduit pour tester, mettre 500 pour production
 BATCH_SIZE = 100     # Taille des lots (arXiv recommande max 2000/jour)
 RETRIES = 5          # Nombre de tentatives en cas d'échec
 DELAY_BETWEEN_REQUESTS = 3  # Délai entre les requêtes (éviter le rate limiting)
+MAX_WORKERS = 3      # Téléchargements simultanés (politesse arXiv)
+
+# Sauvegarde des XML bruts : utile en débogage mais coûteuse en I/O sur
+# les gros volumes, désactivée par défaut (ARXIV_SAVE_RAW=1 pour activer)
+SAVE_RAW_XML = os.environ.get("ARXIV_SAVE_RAW", "0") == "1"
 
 BASE_URL = "http://export.arxiv.org/api/query"
 
-print("=" * 60)
-print("📡 Téléchargement d'articles scientifiques depuis arXiv")
-print("=" * 60)
+# Session persistante : keep-alive vers export.arxiv.org, un seul
+# handshake TCP pour tous les lots au lieu d'un par requête.
+# Retries et backoff sont délégués à urllib3.util.Retry, qui respecte
+# l'en-tête Retry-After renvoyé par arXiv sur les 429
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'})
+_retry = Retry(
+    total=RETRIES,
+    backoff_factor=2,  # Backoff exponentiel
+    status_forcelist=(429, 500, 502, 503, 504),
+    respect_retry_after_header=True,
+    allowed_methods=frozenset(['GET']),
+)
+_adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=_retry)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
 
 # ----------------------------------------------------------
 # Fonctions utilitaires
 # ----------------------------------------------------------
-def safe_request(params, attempt=1):
+def safe_request(params):
     """
-    Effectue une requête HTTP sécurisée avec gestion des erreurs.
+    Effectue une requête HTTP sécurisée.
+    Retries, backoff exponentiel et Retry-After sont gérés par la
+    machine à états Retry d'urllib3 montée sur la session : zéro
+    surcoût Python sur le chemin sans erreur.
     """
-    if attempt > RETRIES:
-        raise Exception(f"❌ Échec après {RETRIES} tentatives pour start={params.get('start', 0)}")
-    
-    try:
-        print(f"   → Tentative {attempt}/{RETRIES}: start={params['start']}")
-        response = requests.get(
-            BASE_URL,
-            params=params,
-            timeout=180,  # Timeout long pour les gros lots
-            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        )
-        
-        if response.status_code == 200:
-            return response.text
-        elif response.status_code == 429:  # Too Many Requests
-            wait_time = 30 * attempt  # Backoff exponentiel
-            print(f"⚠ Rate limit atteint. Attente de {wait_time} secondes...")
-            time.sleep(wait_time)
-            return safe_request(params, attempt + 1)
-        else:
-            print(f"⚠ HTTP Error {response.status_code}: {response.reason}")
-            time.sleep(5)
-            return safe_request(params, attempt + 1)
-            
-    except requests.exceptions.Timeout:
-        print(f"⏳ Timeout, nouvelle tentative dans 10 secondes...")
-        time.sleep(10)
-        return safe_request(params, attempt + 1)
-    except requests.exceptions.ConnectionError:
-        print(f"🔌 Erreur de connexion, nouvelle tentative dans 15 secondes...")
-        time.sleep(15)
-        return safe_request(params, attempt + 1)
-    except Exception as e:
-        print(f"⚠ Erreur inattendue: {type(e).__name__}: {e}")
-        time.sleep(5)
-        return safe_request(params, attempt + 1)
+    print(f"   → Requête: start={params['start']}")
+    response = SESSION.get(
+        BASE_URL,
+        params=params,
+        timeout=180  # Timeout long pour les gros lots
+    )
+    response.raise_for_status()
+    # Renvoyer les bytes bruts : arXiv sert toujours de l'UTF-8, inutile
+    # de payer la détection d'encodage de response.text, et le parseur
+    # XML consomme directement les bytes
+    return response.content
+
+# Limiteur de débit partagé entre les workers : une requête au plus
+# toutes les DELAY_BETWEEN_REQUESTS secondes, quel que soit le thread
+_rate_lock = threading.Lock()
+_next_request_at = 0.0
+
+def _rate_limited_request(params):
+    """Applique l'espacement global entre requêtes puis délègue à safe_request."""
+    global _next_request_at
+    with _rate_lock:
+        wait = _next_request_at - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _next_request_at = time.monotonic() + DELAY_BETWEEN_REQUESTS
+    return safe_request(params)
+
+# Écrivain d'arrière-plan pour les XML bruts : le thread de
+# téléchargement n'attend pas le disque
+_raw_writer = ThreadPoolExecutor(max_workers=1) if SAVE_RAW_XML else None
+
+def _fetch_batch(batch_num, start, params):
+    """Télécharge un lot (et sauvegarde le XML brut si demandé)."""
+    print(f"📦 Lot {batch_num}: start={start}")
+    xml_data = _rate_limited_request(params)
+
+    if _raw_writer is not None:
+        raw_file = RAW_DIR / f"arxiv_raw_{start}.xml"
+        _raw_writer.submit(raw_file.write_bytes, xml_data)
+        print(f"   💾 Fichier brut en cours d'écriture: {raw_file.name}")
+
+    return xml_data
+
+# Namespace pour arXiv, pré-étendu en notation Clark
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_TAG_ENTRY = _ATOM + "entry"
+_TAG_ERROR = _ATOM + "error"
+_TAG_TITLE = _ATOM + "title"
+_TAG_SUMMARY = _ATOM + "summary"
+_TAG_PUBLISHED = _ATOM + "published"
+_TAG_ID = _ATOM + "id"
+_TAG_AUTHOR = _ATOM + "author"
+_TAG_NAME = _ATOM + "name"
+_TAG_CATEGORY = _ATOM + "category"
+
+def _extract_entry(elem, batch_num):
+    """Extrait un document depuis un élément atom:entry, ou None si invalide.
+
+    Une seule passe sur les enfants avec dispatch sur le tag, au lieu de
+    six balayages find/findall du même sous-arbre.
+    """
+    title = summary = published = arxiv_id = ""
+    authors = []
+    categories = []
+
+    for child in elem:
+        tag = child.tag
+        if tag == _TAG_TITLE:
+            # Titre (nettoyage)
+            if child.text:
+                title = child.text.strip()
+        elif tag == _TAG_SUMMARY:
+            # Résumé
+            if child.text:
+                summary = child.text.strip()
+        elif tag == _TAG_PUBLISHED:
+            # Date de publication
+            published = child.text or ""
+        elif tag == _TAG_ID:
+            # ID arXiv (extraire juste l'ID de l'URL)
+            if child.text:
+                arxiv_id = child.text.split("/")[-1].split("v")[0]
+        elif tag == _TAG_AUTHOR:
+            name_elem = child.find(_TAG_NAME)
+            if name_elem is not None and name_elem.text:
+                authors.append(name_elem.text.strip())
+        elif tag == _TAG_CATEGORY:
+            term = child.get("term")
+            if term:
+                categories.append(term)
+
+    # Vérifier que l'article a au moins un titre et un résumé
+    if not (title and summary and len(summary) > 50):  # Exclure les résumés trop courts
+        return None
+
+    return {
+        "arxiv_id": arxiv_id,
+        "title": title.replace("\n", " "),
+        "abstract": summary.replace("\n", " "),
+        "published": published,
+        "authors": authors,
+        "categories": categories,
+        "source": "arXiv",
+        "batch": batch_num
+    }
 
 def parse_arxiv_xml(xml_content, batch_num):
     """
-    Parse le XML d'arXiv et extrait les informations des articles.
+    Parse le XML d'arXiv en flux et extrait les informations des articles.
+    iterparse traite chaque entrée dès sa fermeture puis libère l'arbre :
+    le document complet n'est jamais retenu en mémoire. lxml filtre les
+    tags en C quand il est disponible, sinon repli sur ElementTree.
     """
     docs = []
-    
+
     try:
-        root = ET.fromstring(xml_content)
-        ns = {"atom": "http://www.w3.org/2005/Atom"}
-        
-        # Vérifier s'il y a des erreurs
-        error = root.find("atom:error", ns)
-        if error is not None:
-            print(f"⚠ Erreur dans le XML du batch {batch_num}: {error.text}")
-            return docs
-        
-        entries = root.findall("atom:entry", ns)
-        if not entries:
+        # xml_content arrive en bytes : aucun aller-retour encode/decode
+        buf = io.BytesIO(xml_content)
+
+        if LET is not None:
+            context = LET.iterparse(buf, events=("end",), tag=(_TAG_ENTRY, _TAG_ERROR))
+            for _, elem in context:
+                if elem.tag == _TAG_ERROR:
+                    print(f"⚠ Erreur dans le XML du batch {batch_num}: {elem.text}")
+                    return docs
+                try:
+                    doc = _extract_entry(elem, batch_num)
+                    if doc:
+                        docs.append(doc)
+                except Exception as e:
+                    print(f"   ⚠ Erreur lors du parsing d'une entrée: {e}")
+                finally:
+                    # Libérer l'entrée traitée et ses sœurs déjà consommées
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+        else:
+            context = ET.iterparse(buf, events=("start", "end"))
+            root = None
+            for event, elem in context:
+                if event == "start":
+                    # Mémoriser la racine pour libérer les entrées traitées
+                    if root is None:
+                        root = elem
+                    continue
+
+                if elem.tag == _TAG_ERROR:
+                    print(f"⚠ Erreur dans le XML du batch {batch_num}: {elem.text}")
+                    return docs
+
+                if elem.tag != _TAG_ENTRY:
+                    continue
+
+                try:
+                    doc = _extract_entry(elem, batch_num)
+                    if doc:
+                        docs.append(doc)
+                except Exception as e:
+                    print(f"   ⚠ Erreur lors du parsing d'une entrée: {e}")
+                finally:
+                    elem.clear()
+                    if root is not None:
+                        root.clear()
+
+        if not docs:
             print(f"⚠ Batch {batch_num}: Aucune entrée trouvée dans le XML")
-            return docs
-        
-        for entry in entries:
-            try:
-                # Titre (nettoyage)
-                title_elem = entry.find("atom:title", ns)
-                title = title_elem.text.strip() if title_elem is not None and title_elem.text else ""
-                
-                # Résumé
-                summary_elem = entry.find("atom:summary", ns)
-                summary = summary_elem.text.strip() if summary_elem is not None and summary_elem.text else ""
-                
-                # Date de publication
-                published_elem = entry.find("atom:published", ns)
-                published = published_elem.text if published_elem is not None else ""
-                
-                # Auteurs
-                authors = []
-                for author in entry.findall("atom:author", ns):
-                    name_elem = author.find("atom:name", ns)
-                    if name_elem is not None and name_elem.text:
-                        authors.append(name_elem.text.strip())
-                
-                # ID arXiv
-                id_elem = entry.find("atom:id", ns)
-                arxiv_id = ""
-                if id_elem is not None and id_elem.text:
-                    # Extraire juste l'ID de l'URL
-                    arxiv_id = id_elem.text.split("/")[-1].split("v")[0]
-                
-                # Catégories (subjects)
-                categories = []
-                for category in entry.findall("atom:category", ns):
-                    if category.get("term"):
-                        categories.append(category.get("term"))
-                
-                # Vérifier que l'article a au moins un titre et un résumé
-                if title and summary and len(summary) > 50:  # Exclure les résumés trop courts
-                    doc = {
-                        "arxiv_id": arxiv_id,
-                        "title": title.replace("\n", " "),
-                        "abstract": summary.replace("\n", " "),
-                        "published": published,
-                        "authors": authors,
-                        "categories": categories,
-                        "source": "arXiv",
-                        "batch": batch_num
-                    }
-                    docs.append(doc)
-                    
-            except Exception as e:
-                print(f"   ⚠ Erreur lors du parsing d'une entrée: {e}")
-                continue
-        
+
         return docs
-        
-    except ET.ParseError as e:
+
+    except _PARSE_ERRORS as e:
         print(f"❌ Erreur de parsing XML pour le batch {batch_num}: {e}")
-        # Sauvegarder le XML problématique pour débogage
-        debug_file = RAW_DIR / f"arxiv_debug_batch_{batch_num}.xml"
-        with open(debug_file, "w", encoding="utf-8") as f:
-            f.write(xml_content[:1000])  # Sauvegarder juste le début
+        # Afficher juste le début de la réponse : suffisant pour voir une
+        # page d'erreur HTML ou un flux tronqué, sans écriture disque
+        print(f"   Début de la réponse: {xml_content[:200]!r}")
+        if os.environ.get("ARXIV_DEBUG"):
+            # Dump complet sur disque uniquement sur demande explicite
+            debug_file = RAW_DIR / f"arxiv_debug_batch_{batch_num}.xml"
+            with open(debug_file, "wb") as f:
+                f.write(xml_content)
+            print(f"   💾 XML problématique sauvegardé: {debug_file.name}")
         return []
     except Exception as e:
         print(f"❌ Erreur inattendue lors du parsing batch {batch_num}: {e}")
@@ -176,10 +270,13 @@ def download_arxiv():
     """
     Télécharge les articles depuis arXiv par lots.
     """
+    # Créer les répertoires si nécessaire (au lancement, pas à l'import)
+    RAW_DIR.mkdir(parents=True, exist_ok=True)
+
     all_docs = []
     downloaded_count = 0
     start_time = time.time()
-    
+
     print(f"📊 Catégories: {', '.join(CATEGORIES)}")
     print(f"📊 Nombre total cible: {TOTAL_RESULTS} articles")
     print(f"📊 Taille des lots: {BATCH_SIZE} articles")
@@ -189,61 +286,74 @@ def download_arxiv():
     # Construire la requête de recherche combinée
     search_query = " OR ".join([f"cat:{cat}" for cat in CATEGORIES])
     
-    for start in range(0, TOTAL_RESULTS, BATCH_SIZE):
-        batch_num = start // BATCH_SIZE + 1
-        remaining = min(BATCH_SIZE, TOTAL_RESULTS - start)
-        
-        print(f"\n📦 Lot {batch_num}: {start+1}-{start+remaining}")
-        
-        params = {
-            "search_query": search_query,
-            "start": start,
-            "max_results": BATCH_SIZE,
-            "sortBy": "submittedDate",
-            "sortOrder": "descending"
-        }
-        
-        try:
-            # Récupérer les données XML
-            xml_data = safe_request(params)
-            
-            # Sauvegarder le XML brut
-            raw_file = RAW_DIR / f"arxiv_raw_{start}.xml"
-            with open(raw_file, "w", encoding="utf-8") as f:
-                f.write(xml_data)
-            print(f"   💾 Fichier brut sauvegardé: {raw_file.name}")
-            
-            # Parser le XML
-            batch_docs = parse_arxiv_xml(xml_data, batch_num)
-            
-            if batch_docs:
-                all_docs.extend(batch_docs)
-                downloaded_count += len(batch_docs)
-                print(f"   ✅ {len(batch_docs)} articles extraits (Total: {downloaded_count})")
-            else:
-                print(f"   ⚠ Aucun article valide dans ce lot")
-            
-            # Sauvegarde intermédiaire toutes les 200 entrées
-            if len(all_docs) > 0 and (start + BATCH_SIZE) % 200 == 0:
-                temp_file = DATA_DIR / f"arxiv_intermediate_{start+BATCH_SIZE}.json"
-                with open(temp_file, "w", encoding="utf-8") as f:
-                    json.dump(all_docs, f, indent=2, ensure_ascii=False)
-                print(f"   💾 Sauvegarde intermédiaire: {temp_file.name}")
-            
-            # Délai pour éviter le rate limiting
-            if start + BATCH_SIZE < TOTAL_RESULTS:
-                print(f"   ⏳ Attente de {DELAY_BETWEEN_REQUESTS} secondes...")
-                time.sleep(DELAY_BETWEEN_REQUESTS)
-                
-        except KeyboardInterrupt:
-            print("\n⚠ Téléchargement interrompu par l'utilisateur.")
-            break
-        except Exception as e:
-            print(f"❌ Erreur critique pour le lot {batch_num}: {e}")
-            print("   Passage au lot suivant...")
-            time.sleep(10)
-            continue
-    
+    try:
+        # Préparer tous les lots puis les télécharger en parallèle : les
+        # latences réseau se recouvrent entre workers et le limiteur de
+        # débit conserve l'espacement global des requêtes
+        batches = []
+        for start in range(0, TOTAL_RESULTS, BATCH_SIZE):
+            batch_num = start // BATCH_SIZE + 1
+            batches.append((batch_num, start, {
+                "search_query": search_query,
+                "start": start,
+                "max_results": BATCH_SIZE,
+                "sortBy": "submittedDate",
+                "sortOrder": "descending"
+            }))
+
+        next_checkpoint = 200
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(_fetch_batch, batch_num, start, params): batch_num
+                for batch_num, start, params in batches
+            }
+
+            try:
+                for future in as_completed(futures):
+                    batch_num = futures[future]
+                    try:
+                        xml_data = future.result()
+                    except Exception as e:
+                        print(f"❌ Erreur critique pour le lot {batch_num}: {e}")
+                        print("   Passage au lot suivant...")
+                        continue
+
+                    # Parser le XML (dans le thread principal, pas de verrou
+                    # nécessaire sur all_docs)
+                    batch_docs = parse_arxiv_xml(xml_data, batch_num)
+                    # Les bytes bruts ne servent plus : libérés tout de suite
+                    # au lieu de vivre jusqu'à la prochaine itération
+                    del xml_data
+
+                    if batch_docs:
+                        all_docs.extend(batch_docs)
+                        downloaded_count += len(batch_docs)
+                        print(f"   ✅ Lot {batch_num}: {len(batch_docs)} articles extraits (Total: {downloaded_count})")
+                    else:
+                        print(f"   ⚠ Lot {batch_num}: aucun article valide")
+
+                    # Sauvegarde intermédiaire toutes les ~200 entrées
+                    if len(all_docs) >= next_checkpoint:
+                        temp_file = DATA_DIR / f"arxiv_intermediate_{next_checkpoint}.json"
+                        with open(temp_file, "wb") as f:
+                            f.write(orjson.dumps(all_docs))
+                        print(f"   💾 Sauvegarde intermédiaire: {temp_file.name}")
+                        next_checkpoint += 200
+
+            except KeyboardInterrupt:
+                # Annuler les lots encore en file AVANT le __exit__ du
+                # pool, qui attendrait sinon la fin de tous les
+                # téléchargements (chacun espacé par le limiteur de débit)
+                executor.shutdown(wait=False, cancel_futures=True)
+                print("\n⚠ Téléchargement interrompu par l'utilisateur.")
+
+    except KeyboardInterrupt:
+        print("\n⚠ Téléchargement interrompu par l'utilisateur.")
+    finally:
+        SESSION.close()
+        if _raw_writer is not None:
+            _raw_writer.shutdown(wait=True)
+
     # ----------------------------------------------------------
     # Sauvegarde finale
     # ----------------------------------------------------------
@@ -258,46 +368,54 @@ def download_arxiv():
     
     if all_docs:
         # Supprimer les doublons basés sur arXiv_id
-        unique_docs = []
-        seen_ids = set()
-        
+        unique_by_id = {}
+        category_stats = Counter()
+
+        # Déduplication et statistiques par catégorie en une seule passe
         for doc in all_docs:
-            if doc["arxiv_id"] and doc["arxiv_id"] not in seen_ids:
-                seen_ids.add(doc["arxiv_id"])
-                unique_docs.append(doc)
-        
-        # Statistiques par catégorie
-        category_stats = {}
-        for doc in unique_docs:
-            for cat in doc["categories"]:
-                if cat.startswith("cs."):
-                    category_stats[cat] = category_stats.get(cat, 0) + 1
-        
+            aid = doc["arxiv_id"]
+            if aid and aid not in unique_by_id:
+                unique_by_id[aid] = doc
+                category_stats.update(
+                    cat for cat in doc["categories"] if cat.startswith("cs.")
+                )
+
+        unique_docs = list(unique_by_id.values())
+
+        # Libérer la liste complète : seuls les uniques restent en mémoire
+        del all_docs, unique_by_id
+
+        # Tri des statistiques calculé une fois, réutilisé pour la
+        # console et le rapport
+        sorted_stats = category_stats.most_common()
+
         print(f"\n📈 Répartition par catégorie:")
-        for cat, count in sorted(category_stats.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for cat, count in sorted_stats[:10]:
             print(f"   {cat}: {count} articles")
         
-        # Sauvegarder en JSON
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(unique_docs, f, indent=2, ensure_ascii=False, default=str)
-        
+        # Sauvegarder en JSON compact : le pretty-print double la taille
+        # du fichier et le temps de sérialisation
+        with open(OUTPUT_FILE, "wb") as f:
+            f.write(orjson.dumps(unique_docs, default=str))
+
         print(f"\n💾 Données sauvegardées dans: {OUTPUT_FILE}")
-        
-        # Créer également un fichier simplifié pour le nettoyage
-        simplified_docs = [
-            {
-                "title": doc["title"],
-                "abstract": doc["abstract"],
-                "arxiv_id": doc["arxiv_id"],
-                "categories": doc["categories"]
-            }
-            for doc in unique_docs
-        ]
-        
+
+        # Créer également un fichier simplifié pour le nettoyage,
+        # écrit en flux : aucune liste intermédiaire
         simplified_file = DATA_DIR / "arxiv_simplified.json"
-        with open(simplified_file, "w", encoding="utf-8") as f:
-            json.dump(simplified_docs, f, indent=2, ensure_ascii=False)
-        
+        with open(simplified_file, "wb") as f:
+            f.write(b"[")
+            for i, doc in enumerate(unique_docs):
+                if i:
+                    f.write(b",")
+                f.write(orjson.dumps({
+                    "title": doc["title"],
+                    "abstract": doc["abstract"],
+                    "arxiv_id": doc["arxiv_id"],
+                    "categories": doc["categories"]
+                }))
+            f.write(b"]")
+
         print(f"📁 Version simplifiée: {simplified_file}")
         
         # Générer un rapport
@@ -310,7 +428,7 @@ def download_arxiv():
             f.write(f"Durée: {elapsed_time:.1f}s\n")
             f.write(f"Taux: {len(unique_docs)/elapsed_time:.2f} articles/s\n\n")
             f.write("Catégories:\n")
-            for cat, count in sorted(category_stats.items(), key=lambda x: x[1], reverse=True):
+            for cat, count in sorted_stats:
                 f.write(f"  {cat}: {count}\n")
         
         print(f"📄 Rapport généré: {report_file}")
@@ -383,9 +501,9 @@ def create_sample_data():
         }
     ]
     
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(sample_docs, f, indent=2, ensure_ascii=False)
-    
+    with open(OUTPUT_FILE, "wb") as f:
+        f.write(orjson.dumps(sample_docs, option=orjson.OPT_INDENT_2))
+
     print(f"✅ Données d'exemple créées: {OUTPUT_FILE}")
     return sample_docs
 
@@ -393,6 +511,10 @@ def create_sample_data():
 # Point d'entrée
 # ----------------------------------------------------------
 if __name__ == "__main__":
+    print("=" * 60)
+    print("📡 Téléchargement d'articles scientifiques depuis arXiv")
+    print("=" * 60)
+
     try:
         result = download_arxiv()
         if not result:
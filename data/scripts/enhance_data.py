@@ -3,49 +3,40 @@
 Enrichit les données avec plus d'informations depuis arXiv.
 """
 
-import json
+import orjson
+import multiprocessing
+from functools import lru_cache, partial
 from pathlib import Path
 import re
 from datetime import datetime
 from collections import Counter
 
-def extract_year_from_id(arxiv_id):
-    """Extrait l'année de publication depuis l'ID arXiv"""
-    if not arxiv_id:
-        return None
-    
-    # Format arXiv: YYMM.NNNNN ou YYMM.NNNNNvN
-    try:
-        if '.' in arxiv_id:
-            year_part = arxiv_id.split('.')[0]
-            if len(year_part) >= 4 and year_part.isdigit():
-                year_two_digit = int(year_part[:2])
-                # Supposition: après 2000
-                if year_two_digit < 50:
-                    return 2000 + year_two_digit
-                else:
-                    return 1900 + year_two_digit
-    except:
-        pass
-    
-    return None
+@lru_cache(maxsize=65536)
+def _parse_yymm(arxiv_id):
+    """Extrait (année, mois) depuis l'ID arXiv en une seule analyse.
 
-def extract_month_from_id(arxiv_id):
-    """Extrait le mois de publication depuis l'ID arXiv"""
-    if not arxiv_id:
-        return None
-    
-    try:
-        if '.' in arxiv_id:
-            month_part = arxiv_id.split('.')[0]
-            if len(month_part) >= 4 and month_part.isdigit():
-                month = int(month_part[2:4])
-                if 1 <= month <= 12:
-                    return month
-    except:
-        pass
-    
-    return None
+    Format arXiv: YYMM.NNNNN ou YYMM.NNNNNvN. Le résultat est mémoïsé :
+    les IDs revus (doublons partiels) ne coûtent qu'un lookup.
+    """
+    if not arxiv_id or '.' not in arxiv_id:
+        return (None, None)
+
+    prefix = arxiv_id.split('.', 1)[0]
+    if len(prefix) < 4 or not prefix.isdigit():
+        return (None, None)
+
+    year_two_digit = int(prefix[:2])
+    # Supposition: après 2000
+    if year_two_digit < 50:
+        year = 2000 + year_two_digit
+    else:
+        year = 1900 + year_two_digit
+
+    month = int(prefix[2:4])
+    if not 1 <= month <= 12:
+        month = None
+
+    return (year, month)
 
 def extract_main_category(categories):
     """Extrait la catégorie principale"""
@@ -60,119 +51,127 @@ def extract_main_category(categories):
     # Sinon, prendre la première catégorie
     return categories[0] if categories else None
 
+# Tokenisation : regex précompilée une fois pour toutes
+_WORD_RE = re.compile(r'[a-zA-Z]{4,}')
+
+# Liste de mots vides (stop words) en anglais, figée au niveau module
+_STOP_WORDS = frozenset({
+    'the', 'and', 'for', 'with', 'using', 'based', 'from', 'this', 'that',
+    'which', 'have', 'been', 'were', 'will', 'can', 'could', 'would',
+    'should', 'about', 'their', 'there', 'what', 'when', 'where', 'why',
+    'how', 'then', 'than', 'also', 'more', 'most', 'less', 'least',
+    'very', 'such', 'some', 'any', 'all', 'both', 'each', 'every',
+    'these', 'those', 'other', 'another', 'same', 'different',
+    'between', 'among', 'through', 'during', 'before', 'after',
+    'above', 'below', 'under', 'over', 'into', 'onto', 'upon'
+})
+
 def extract_keywords_from_text(text, max_keywords=10):
     """Extrait les mots-clés les plus fréquents d'un texte"""
     if not text:
         return []
-    
-    # Tokenisation simple
-    words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
-    
-    # Liste de mots vides (stop words) en anglais
-    stop_words = {
-        'the', 'and', 'for', 'with', 'using', 'based', 'from', 'this', 'that',
-        'which', 'have', 'been', 'were', 'will', 'can', 'could', 'would',
-        'should', 'about', 'their', 'there', 'what', 'when', 'where', 'why',
-        'how', 'then', 'than', 'also', 'more', 'most', 'less', 'least',
-        'very', 'such', 'some', 'any', 'all', 'both', 'each', 'every',
-        'these', 'those', 'other', 'another', 'same', 'different',
-        'between', 'among', 'through', 'during', 'before', 'after',
-        'above', 'below', 'under', 'over', 'into', 'onto', 'upon'
-    }
-    
-    # Filtrer les stop words et les mots courts
-    filtered_words = [word for word in words if word not in stop_words]
-    
-    # Compter les fréquences
-    word_counter = Counter(filtered_words)
-    
+
+    # Tokenisation, filtrage et comptage fusionnés en une passe ;
+    # lower() par mot évite la copie complète du texte
+    word_counter = Counter(
+        word for word in (m.group().lower() for m in _WORD_RE.finditer(text))
+        if word not in _STOP_WORDS
+    )
+
     # Retourner les mots-clés les plus fréquents
     return [word for word, _ in word_counter.most_common(max_keywords)]
 
+def _enhance_one(article, now_iso):
+    """Enrichit un article en place (transformation indépendante par article)."""
+    # Extraire l'année et le mois de publication en une seule analyse
+    year, month = _parse_yymm(article.get('arxiv_id', ''))
+    if year:
+        article['publication_year'] = year
+    if month:
+        article['publication_month'] = month
+
+    # Extraire la catégorie principale
+    main_category = extract_main_category(article.get('categories', []))
+    if main_category:
+        article['main_category'] = main_category
+
+    # Nombre d'auteurs
+    authors = article.get('authors', [])
+    if authors:
+        article['author_count'] = len(authors)
+
+    # Statistiques de texte
+    abstract = article.get('abstract', '')
+    if abstract:
+        article['abstract_length'] = len(abstract)
+        article['abstract_word_count'] = len(abstract.split())
+
+        # Extraire les mots-clés du résumé
+        keywords = extract_keywords_from_text(abstract, max_keywords=5)
+        if keywords:
+            article['abstract_keywords'] = keywords
+
+    # Mots-clés du titre
+    title = article.get('title', '')
+    if title:
+        title_keywords = extract_keywords_from_text(title, max_keywords=3)
+        if title_keywords:
+            article['title_keywords'] = title_keywords
+
+    # Date de mise à jour
+    article['last_updated'] = now_iso
+
+    # Source
+    article['source'] = 'arXiv'
+
+    return article
+
 def enhance_arxiv_data():
     """Enrichit les données arXiv avec plus d'informations"""
     data_dir = Path(__file__).parent.parent
-    input_file = data_dir / "cleaned" / "cleaned_cs.json"
+    input_file = data_dir / "cleaned" / "cleaned_cs.jsonl"
     output_file = data_dir / "cleaned" / "enhanced_cs.json"
-    
+
     if not input_file.exists():
         print(f"❌ Fichier introuvable: {input_file}")
         return None
-    
+
     print("📖 Chargement des données...")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # JSON Lines : un document par ligne
+    with open(input_file, 'rb') as f:
+        data = [orjson.loads(line) for line in f if line.strip()]
     
     print(f"🔍 Enrichissement de {len(data)} articles...")
-    
-    enhanced_data = []
+
+    # Horodatage calculé une seule fois pour tout le lot ; chaque article
+    # est enrichi en place (pas de copy) et les articles étant
+    # indépendants, le travail est réparti sur tous les cœurs
+    now_iso = datetime.now().isoformat()
+    with multiprocessing.Pool() as pool:
+        enhanced_data = pool.map(
+            partial(_enhance_one, now_iso=now_iso), data, chunksize=256
+        )
+
+    # Statistiques d'enrichissement (une passe légère sur le résultat)
     stats = {
         'with_year': 0,
         'with_month': 0,
         'with_main_category': 0,
         'with_keywords': 0
     }
-    
-    for i, article in enumerate(data):
-        enhanced = article.copy()
-        
-        # Extraire l'année de publication
-        year = extract_year_from_id(article.get('arxiv_id', ''))
-        if year:
-            enhanced['publication_year'] = year
+    for enhanced in enhanced_data:
+        if 'publication_year' in enhanced:
             stats['with_year'] += 1
-        
-        # Extraire le mois de publication
-        month = extract_month_from_id(article.get('arxiv_id', ''))
-        if month:
-            enhanced['publication_month'] = month
+        if 'publication_month' in enhanced:
             stats['with_month'] += 1
-        
-        # Extraire la catégorie principale
-        categories = article.get('categories', [])
-        main_category = extract_main_category(categories)
-        if main_category:
-            enhanced['main_category'] = main_category
+        if 'main_category' in enhanced:
             stats['with_main_category'] += 1
-        
-        # Nombre d'auteurs
-        authors = article.get('authors', [])
-        if authors:
-            enhanced['author_count'] = len(authors)
-        
-        # Statistiques de texte
-        abstract = article.get('abstract', '')
-        if abstract:
-            enhanced['abstract_length'] = len(abstract)
-            enhanced['abstract_word_count'] = len(abstract.split())
-            
-            # Extraire les mots-clés du résumé
-            keywords = extract_keywords_from_text(abstract, max_keywords=5)
-            if keywords:
-                enhanced['abstract_keywords'] = keywords
-                stats['with_keywords'] += 1
-        
-        # Mots-clés du titre
-        title = article.get('title', '')
-        if title:
-            title_keywords = extract_keywords_from_text(title, max_keywords=3)
-            if title_keywords:
-                enhanced['title_keywords'] = title_keywords
-        
-        # Date de mise à jour
-        enhanced['last_updated'] = datetime.now().isoformat()
-        
-        # Source
-        enhanced['source'] = 'arXiv'
-        
-        enhanced_data.append(enhanced)
-        
-        if (i + 1) % 100 == 0:
-            print(f"  ✓ {i + 1}/{len(data)} articles traités")
+        if 'abstract_keywords' in enhanced:
+            stats['with_keywords'] += 1
     
-    # Sauvegarder
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(enhanced_data, f, indent=2, ensure_ascii=False)
+    # Sauvegarder (orjson écrit directement des bytes UTF-8)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(enhanced_data, option=orjson.OPT_INDENT_2))
     
     print(f"\n✅ Données enrichies sauvegardées: {output_file}")
     print(f"📊 Statistiques d'enrichissement:")
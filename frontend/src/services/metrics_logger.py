@@ -1,23 +1,80 @@
 # backend/services/metrics_logger.py
 import json
+import sys
 import time
+
+# orjson si disponible : sérialisation C en un seul appel, bien plus
+# rapide que le pretty-printer pur Python de la stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from collections import Counter, deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-import numpy as np
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional
 from pathlib import Path
 import logging
+import logging.handlers
+
+# Barres de l'histogramme précalculées une fois pour toutes les longueurs
+# possibles (0 à 40) : zéro allocation de chaîne par bin à l'affichage
+_BAR_CACHE = ["█" * i + "░" * (40 - i) for i in range(41)]
+
+# Séparateurs de rapport construits une seule fois à l'import au lieu
+# d'une concaténation emoji + "="*60 à chaque recherche
+_HR = "=" * 60
+_HR_SEARCH = "🔍" + _HR
+_HR_RESULTS = "📊" + _HR
+_HR_HISTORY = "📋" + _HR
+_HR_ERROR = "❌" + _HR
+
+# Médailles du podium : indexation directe, pas de chaîne de conditions
+_MEDALS = ("🥇", "🥈", "🥉")
+
+def _score_stats(scores):
+    """Retourne (min, max, moyenne, médiane basse) d'une liste de scores.
+
+    Pour les petits lots — le cas courant — un tri pur Python évite
+    l'aller-retour par un ndarray (allocation, inférence de dtype) qui
+    coûte plus cher que le calcul lui-même ; NumPy ne reprend la main
+    que sur les gros lots.
+    """
+    n = len(scores)
+    if n > 256:
+        # Import paresseux : NumPy n'est chargé que si un gros lot
+        # l'exige vraiment (le module est mis en cache ensuite)
+        import numpy as np
+        arr = np.asarray(scores, dtype=np.float32)
+        return float(arr.min()), float(arr.max()), float(arr.mean()), float(np.median(arr))
+    s = sorted(scores)
+    return s[0], s[-1], sum(s) / n, s[n // 2]
 
 class ServerMetricsLogger:
     """Logger pour afficher les métriques dans le terminal VS Code"""
     
     def __init__(self, log_file: str = None):
         self.log_file = log_file
-        self.search_history: List[Dict] = []
         self.max_history = 100
+        # deque à taille bornée : appendleft en O(1) avec éviction
+        # automatique, au lieu du insert(0) qui décale toute la liste
+        self.search_history: Deque[Dict] = deque(maxlen=self.max_history)
         
         # Configuration du logging
         self.setup_logging()
-        
+
+        # Chemin rapide : sans fichier de log, les rapports partent
+        # directement sur stdout — pas de construction de LogRecord ni de
+        # sys._getframe par appel, qui dominent le coût de logger.info
+        self._fast_emit = sys.stdout.write if log_file is None else None
+
+    def _emit_info(self, text: str):
+        """Émet un bloc de rapport : stdout direct si possible, sinon logger"""
+        if self._fast_emit is not None:
+            self._fast_emit(text + "\n")
+        else:
+            self.logger.info(text)
+
     def setup_logging(self):
         """Configure le logging pour VS Code terminal"""
         # Créer un formateur personnalisé
@@ -36,160 +93,211 @@ class ServerMetricsLogger:
         self.logger.setLevel(logging.INFO)
         self.logger.addHandler(console_handler)
         
-        # Fichier de log si spécifié
+        # Fichier de log si spécifié : les enregistrements sont tamponnés
+        # en mémoire et vidés par paquets (ou immédiatement sur ERROR),
+        # au lieu d'un write() + flush() disque par ligne
         if self.log_file:
-            file_handler = logging.FileHandler(self.log_file)
+            file_handler = logging.FileHandler(self.log_file, delay=True)
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+            buffered_handler = logging.handlers.MemoryHandler(
+                capacity=512,
+                flushLevel=logging.ERROR,
+                target=file_handler
+            )
+            self.logger.addHandler(buffered_handler)
     
     def log_search_start(self, query: str, search_type: str = "semantic"):
         """Log le début d'une recherche"""
-        self.logger.info("🔍" + "="*60)
-        self.logger.info(f"🔍 NOUVELLE RECHERCHE: {query}")
-        self.logger.info(f"🔍 Type: {search_type}")
-        self.logger.info(f"🔍 Heure: {datetime.now().strftime('%H:%M:%S')}")
-        self.logger.info("🔍" + "="*60)
+        # Une seule émission : un verrou de handler et un write() au lieu
+        # d'un par ligne
+        self._emit_info("\n".join([
+            _HR_SEARCH,
+            f"🔍 NOUVELLE RECHERCHE: {query}",
+            f"🔍 Type: {search_type}",
+            f"🔍 Heure: {datetime.now().strftime('%H:%M:%S')}",
+            _HR_SEARCH,
+        ]))
         return time.time()
     
     def log_search_results(self, query: str, results: List[Dict], 
                           execution_time: float, search_type: str = "semantic"):
         """Log les résultats d'une recherche"""
+
+        # Si le niveau INFO est filtré (et sans chemin stdout direct),
+        # inutile de calculer scores, catégories et histogramme : on
+        # archive juste la recherche dans l'historique
+        if self._fast_emit is None and not self.logger.isEnabledFor(logging.INFO):
+            self.save_to_history(query, results, execution_time, search_type)
+            return
+
+        # Aucun résultat : message court et archivage ; tout le reste de
+        # la fonction peut supposer au moins un résultat
+        if not results:
+            self._emit_info(f"📄 Aucun résultat pour: {query}")
+            self.save_to_history(query, results, execution_time, search_type)
+            return
+
+        # Une seule traversée des résultats : liste des scores, compteur
+        # de catégories et top 3 remplis dans la même boucle au lieu de
+        # trois passes séparées sur la liste de dicts
+        scores = []
+        cats_counter = Counter()
+        top3 = []
+        for i, r in enumerate(results):
+            scores.append(float(r.get('similarity_score', r.get('score', 0.0))))
+            cats_counter.update(r.get('categories', ()))
+            if i < 3:
+                top3.append(r)
         
-        # Calculer les métriques
-        scores = [r.get('similarity_score', r.get('score', 0)) for r in results]
-        if isinstance(scores[0], (int, float)):
-            scores = [float(s) for s in scores]
-        else:
-            scores = []
-        
-        # Afficher le résumé
-        self.logger.info("📊" + "="*60)
-        self.logger.info("📊 RÉSUMÉ DES RÉSULTATS")
-        self.logger.info("📊" + "="*60)
-        
-        self.logger.info(f"📋 Requête: {query}")
-        self.logger.info(f"🎯 Type: {search_type}")
-        self.logger.info(f"⏱️  Temps: {execution_time:.2f}ms")
-        self.logger.info(f"📄 Résultats: {len(results)}")
-        
+        # Construire tout le rapport en mémoire puis l'émettre en un seul
+        # appel logger : un verrou de handler, un write() et une résolution
+        # de %(asctime)s au lieu d'une trentaine
+        lines = [
+            _HR_RESULTS,
+            "📊 RÉSUMÉ DES RÉSULTATS",
+            _HR_RESULTS,
+            f"📋 Requête: {query}",
+            f"🎯 Type: {search_type}",
+            f"⏱️  Temps: {execution_time:.2f}ms",
+            f"📄 Résultats: {len(results)}",
+        ]
+
         if scores:
-            self.logger.info(f"🏆 Score max: {max(scores)*100:.1f}%")
-            self.logger.info(f"📊 Score moyen: {np.mean(scores)*100:.1f}%")
-            self.logger.info(f"📉 Score médian: {np.median(scores)*100:.1f}%")
-            self.logger.info(f"⚖️  Score min: {min(scores)*100:.1f}%")
-        
-        # Afficher le top 3
-        self.logger.info("\n🥇 TOP 3 DES RÉSULTATS:")
-        for i, result in enumerate(results[:3]):
-            score = result.get('similarity_score', result.get('score', 0))
-            title = result.get('title', '')[:60] + "..." if len(result.get('title', '')) > 60 else result.get('title', '')
-            category = result.get('categories', [''])[0] if result.get('categories') else 'N/A'
-            medal = "🥇" if i == 0 else "🥈" if i == 1 else "🥉"
-            self.logger.info(f"{medal} {title}")
-            self.logger.info(f"   Score: {float(score)*100:.1f}% | Catégorie: {category}")
-        
-        # Distribution des catégories
-        if results:
-            categories = {}
-            for result in results:
-                for cat in result.get('categories', []):
-                    categories[cat] = categories.get(cat, 0) + 1
-            
-            if categories:
-                self.logger.info("\n🏷️  DISTRIBUTION DES CATÉGORIES:")
-                sorted_cats = sorted(categories.items(), key=lambda x: x[1], reverse=True)[:5]
-                for cat, count in sorted_cats:
-                    percentage = (count / len(results)) * 100
-                    self.logger.info(f"  {cat}: {count} articles ({percentage:.1f}%)")
-        
-        # Histogramme ASCII des scores
+            s_min, s_max, s_mean, s_median = _score_stats(scores)
+            lines.append(f"🏆 Score max: {s_max*100:.1f}%")
+            lines.append(f"📊 Score moyen: {s_mean*100:.1f}%")
+            lines.append(f"📉 Score médian: {s_median*100:.1f}%")
+            lines.append(f"⚖️  Score min: {s_min*100:.1f}%")
+
+        # Afficher le top 3 (capturé lors de la passe unique)
+        lines.append("\n🥇 TOP 3 DES RÉSULTATS:")
+        for i, result in enumerate(top3):
+            # Chaque champ lu une seule fois dans le dict
+            title = result.get('title') or ''
+            if len(title) > 60:
+                title = title[:60] + "..."
+            cats = result.get('categories')
+            category = cats[0] if cats else 'N/A'
+            lines.append(f"{_MEDALS[i]} {title}")
+            lines.append(f"   Score: {scores[i]*100:.1f}% | Catégorie: {category}")
+
+        # Distribution des catégories : top 5 via le tas de most_common,
+        # pas de tri complet du compteur
+        if cats_counter:
+            lines.append("\n🏷️  DISTRIBUTION DES CATÉGORIES:")
+            for cat, count in cats_counter.most_common(5):
+                percentage = (count / len(results)) * 100
+                lines.append(f"  {cat}: {count} articles ({percentage:.1f}%)")
+
+        # Histogramme ASCII des scores (la même liste est réutilisée)
         if scores:
-            self.logger.info("\n📈 DISTRIBUTION DES SCORES:")
-            self.display_histogram(scores)
-        
-        self.logger.info("="*60 + "\n")
-        
+            lines.append("\n📈 DISTRIBUTION DES SCORES:")
+            lines.extend(self._histogram_lines(scores))
+
+        lines.append(_HR + "\n")
+        self._emit_info("\n".join(lines))
+
         # Sauvegarder dans l'historique
         self.save_to_history(query, results, execution_time, search_type)
     
-    def display_histogram(self, scores: List[float], bins: int = 10):
+    def display_histogram(self, scores, bins: int = 10):
         """Affiche un histogramme ASCII des scores"""
-        if not scores:
-            return
-        
-        # Convertir en pourcentages
-        percentages = [s * 100 for s in scores]
-        
-        # Créer les bins
-        min_val, max_val = min(percentages), max(percentages)
-        bin_width = (max_val - min_val) / bins
-        
-        histogram = [0] * bins
-        for p in percentages:
-            bin_idx = min(int((p - min_val) / bin_width), bins - 1)
-            histogram[bin_idx] += 1
-        
-        # Afficher l'histogramme
-        max_count = max(histogram) if histogram else 1
+        hist_lines = self._histogram_lines(scores, bins)
+        if hist_lines:
+            self._emit_info("\n".join(hist_lines))
+
+    def _histogram_lines(self, scores, bins: int = 10):
+        """Construit les lignes de l'histogramme ASCII des scores"""
+        if len(scores) == 0:
+            return []
+
+        import numpy as np
+
+        # Convertir en pourcentages (opération vectorisée)
+        percentages = np.asarray(scores, dtype=np.float32) * 100
+
+        # Binning vectorisé : les bins étant uniformes, np.histogram fait
+        # tout le découpage en une passe C au lieu d'une boucle Python
+        counts, edges = np.histogram(percentages, bins=bins)
+
+        # Construire l'histogramme
+        max_count = int(counts.max()) or 1
+        total = len(percentages)
+        hist_lines = []
         for i in range(bins):
-            count = histogram[i]
-            bar_length = int((count / max_count) * 40)
-            bar = "█" * bar_length + "░" * (40 - bar_length)
-            
-            range_start = min_val + i * bin_width
-            range_end = min_val + (i + 1) * bin_width
-            
+            count = int(counts[i])
             if count > 0:
-                percentage = (count / len(scores)) * 100
-                self.logger.info(f"  [{range_start:.1f}-{range_end:.1f}%]: {bar} {count} ({percentage:.1f}%)")
+                bar = _BAR_CACHE[int((count / max_count) * 40)]
+                percentage = (count / total) * 100
+                hist_lines.append(f"  [{edges[i]:.1f}-{edges[i + 1]:.1f}%]: {bar} {count} ({percentage:.1f}%)")
+        return hist_lines
     
     def save_to_history(self, query: str, results: List[Dict], 
                        execution_time: float, search_type: str):
         """Sauvegarde la recherche dans l'historique"""
+        top_scores = [float(r.get('similarity_score', r.get('score', 0.0))) for r in results[:5]]
+
+        # L'heure est formatée une fois à l'insertion (show_history ne
+        # re-parse plus d'ISO) ; l'epoch numérique reste là pour l'export
         entry = {
-            'timestamp': datetime.now().isoformat(),
+            'ts_hms': datetime.now().strftime('%H:%M:%S'),
+            'ts_epoch': time.time(),
             'query': query,
             'search_type': search_type,
             'execution_time': execution_time,
             'total_results': len(results),
-            'top_scores': [r.get('similarity_score', r.get('score', 0)) for r in results[:5]],
-            'categories': list(set([cat for r in results for cat in r.get('categories', [])]))
+            'top_scores': top_scores,
+            # Moyenne calculée une fois ici : show_history la relit au lieu
+            # de rappeler np.mean sur 5 éléments à chaque affichage
+            'avg_top': sum(top_scores) / len(top_scores) if top_scores else 0.0,
+            # Compréhension d'ensemble directe : pas de liste intermédiaire
+            # avec doublons, et () en défaut évite une liste vide par résultat
+            'categories': list({cat for r in results for cat in r.get('categories', ())})
         }
         
-        self.search_history.insert(0, entry)
-        if len(self.search_history) > self.max_history:
-            self.search_history.pop()
+        self.search_history.appendleft(entry)
     
     def show_history(self):
         """Affiche l'historique des recherches"""
-        self.logger.info("📋" + "="*60)
-        self.logger.info("📋 HISTORIQUE DES RECHERCHES")
-        self.logger.info("📋" + "="*60)
-        
-        for i, entry in enumerate(self.search_history[:10]):  # Montrer les 10 dernières
-            date_str = datetime.fromisoformat(entry['timestamp']).strftime('%H:%M:%S')
-            avg_score = np.mean(entry['top_scores']) * 100 if entry['top_scores'] else 0
-            
-            self.logger.info(f"{i+1}. [{date_str}] {entry['query'][:40]}...")
-            self.logger.info(f"   Type: {entry['search_type']} | Temps: {entry['execution_time']:.0f}ms")
-            self.logger.info(f"   Résultats: {entry['total_results']} | Score moyen: {avg_score:.1f}%")
-        
-        self.logger.info("="*60)
+        lines = [
+            _HR_HISTORY,
+            "📋 HISTORIQUE DES RECHERCHES",
+            _HR_HISTORY,
+        ]
+
+        for i, entry in enumerate(islice(self.search_history, 10)):  # Montrer les 10 dernières
+            avg_score = entry['avg_top'] * 100
+
+            lines.append(f"{i+1}. [{entry['ts_hms']}] {entry['query'][:40]}...")
+            lines.append(f"   Type: {entry['search_type']} | Temps: {entry['execution_time']:.0f}ms")
+            lines.append(f"   Résultats: {entry['total_results']} | Score moyen: {avg_score:.1f}%")
+
+        lines.append(_HR)
+        self._emit_info("\n".join(lines))
     
     def export_history(self, filename: str = "search_history.json"):
         """Exporte l'historique au format JSON"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.search_history, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            # Fichier binaire + orjson : une seule sérialisation C,
+            # pas d'encodage UTF-8 écriture par écriture
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(
+                    list(self.search_history),
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                ))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(list(self.search_history), f, indent=2, ensure_ascii=False)
         
-        self.logger.info(f"✅ Historique exporté vers {filename}")
+        self._emit_info(f"✅ Historique exporté vers {filename}")
     
     def log_error(self, error: Exception, context: str = ""):
         """Log une erreur"""
-        self.logger.error("❌" + "="*60)
-        self.logger.error(f"❌ ERREUR: {str(error)}")
+        lines = [_HR_ERROR, f"❌ ERREUR: {str(error)}"]
         if context:
-            self.logger.error(f"❌ Contexte: {context}")
-        self.logger.error("❌" + "="*60)
+            lines.append(f"❌ Contexte: {context}")
+        lines.append(_HR_ERROR)
+        self.logger.error("\n".join(lines))
 
 # Instance singleton
 server_metrics_logger = ServerMetricsLogger()
\ No newline at end of file
@@ -2,7 +2,7 @@ import sys
 sys.path.append('.')
 from ai.semantic_search.search_engine import SemanticSearchEngine
 
-# Initialiser
+# Initialiser (une seule fois, le moteur est réutilisé pour toutes les requêtes)
 engine = SemanticSearchEngine()
 
 # Recherches de test
@@ -15,15 +15,17 @@ queries = [
 ]
 
 for query in queries:
-    print(f"\n🔍 Recherche: '{query}'")
-    print("=" * 60)
+    # Sortie assemblée en mémoire puis affichée en un seul print :
+    # un write() par requête au lieu d'un par ligne
+    buf = [f"\n🔍 Recherche: '{query}'", "=" * 60]
     results = engine.search_with_scores(query, 3)
     if results:
         for i, r in enumerate(results, 1):
-            print(f"{i}. Score: {r['score']:.4f}")
-            print(f"   Titre: {r['title'][:70]}")
+            buf.append(f"{i}. Score: {r['score']:.4f}")
+            buf.append(f"   Titre: {r['title'][:70]}")
             if r['abstract']:
-                print(f"   Résumé: {r['abstract'][:100]}...")
-            print()
+                buf.append(f"   Résumé: {r['abstract'][:100]}...")
+            buf.append("")
     else:
-        print("❌ Aucun résultat trouvé")
+        buf.append("❌ Aucun résultat trouvé")
+    print("\n".join(buf))